@@ -12,5 +12,8 @@ setup(
             'callback_server = aio.callback_server:main',
         ]
     },
+    extras_require={
+        'uvloop': ['uvloop'],
+    },
     tests_require=['pytest'],
 )
@@ -1,6 +1,6 @@
-from ._errors import CancelledError, InvalidStateError
+from ._errors import CancelledError, InvalidStateError, QueueEmpty, QueueFull
 
-from ._future import Future
+from ._future import Future, wrap_future
 
 from ._loop import (
     run, get_running_loop,
@@ -8,7 +8,27 @@ from ._loop import (
     Loop,
     Handle, TimerHandle)
 
-from ._task import Task, ensure_future, current_task, all_tasks
+from ._task import Task, ensure_future, current_task, all_tasks, sleep
+
+from ._transports import BaseProtocol, Protocol, Transport, Server
+
+from ._streams import (
+    StreamReader, StreamReaderProtocol, StreamWriter, IncompleteReadError, LimitOverrunError,
+    open_connection, start_server)
+
+from ._combinators import (
+    gather, wait, wait_for, as_completed,
+    FIRST_COMPLETED, FIRST_EXCEPTION, ALL_COMPLETED)
+
+from ._locks import Lock, Event, Condition, Semaphore, BoundedSemaphore
+
+from ._queues import Queue, LifoQueue, PriorityQueue
+
+from ._task_groups import TaskGroup
+
+from ._timeouts import Timeout, timeout
+
+from ._threads import run_in_threads
 
 
 def _configure_logging():
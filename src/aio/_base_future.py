@@ -4,6 +4,8 @@ from . import _loop
 
 
 class BaseFuture(metaclass=abc.ABCMeta):
+    __slots__ = ()
+
     @abc.abstractmethod
     def result(self) -> object:
         raise NotImplementedError
@@ -0,0 +1,221 @@
+import collections
+import functools
+import typing as tp
+
+from . import _errors
+from . import _future
+from . import _locks
+from . import _loop
+from . import _task
+
+FIRST_COMPLETED = 'FIRST_COMPLETED'
+FIRST_EXCEPTION = 'FIRST_EXCEPTION'
+ALL_COMPLETED = 'ALL_COMPLETED'
+
+_RETURN_WHEN_VALUES = (FIRST_COMPLETED, FIRST_EXCEPTION, ALL_COMPLETED)
+
+
+class _GatheringFuture(_future.Future):
+    __slots__ = ('_children', '_num_left', '_return_exceptions', '_is_cancel_requested')
+
+    def __init__(self, children: tp.List, return_exceptions: bool, *, loop) -> None:
+        super().__init__(loop=loop)
+        self._children = children
+        self._num_left = len(children)
+        self._return_exceptions = return_exceptions
+        self._is_cancel_requested = False
+        # the same bound method is shared by all children
+        on_child_done = self._on_child_done
+        for child in children:
+            child.add_done_callback(on_child_done)
+
+    def cancel(self) -> bool:
+        if self.done():
+            return False
+        is_cancelled = False
+        for child in self._children:
+            if child.cancel():
+                is_cancelled = True
+        if is_cancelled:
+            self._is_cancel_requested = True
+        return is_cancelled
+
+    def _on_child_done(self, child) -> None:
+        self._num_left -= 1
+        if self.done():
+            return
+        if not self._return_exceptions:
+            if child.cancelled():
+                _future.Future.cancel(self)
+                return
+            if child.exception() is not None:
+                self._set_exception(child.exception())
+                return
+        if self._num_left:
+            return
+        if self._is_cancel_requested:
+            _future.Future.cancel(self)
+        else:
+            self._set_result([_get_outcome(child) for child in self._children])
+
+
+class _WaitCounter:
+    __slots__ = ('_waiter', '_num_left', '_return_when')
+
+    def __init__(self, waiter, num_left: int, return_when: str) -> None:
+        self._waiter = waiter
+        self._num_left = num_left
+        self._return_when = return_when
+
+    def __call__(self, future) -> None:
+        self._num_left -= 1
+        if (self._num_left == 0
+                or self._return_when == FIRST_COMPLETED
+                or (self._return_when == FIRST_EXCEPTION and _has_failed(future))):
+            _release_waiter(self._waiter)
+
+
+class _CompletionQueue:
+    def __init__(self, loop, futures: tp.Set, timeout: tp.Optional[float]) -> None:
+        self._pending = futures
+        self._done = collections.deque()
+        # as_completed() awaitables can be awaited concurrently, e.g. with gather()
+        self._waiters = _locks._WaiterQueue()
+        self._timeout_handle = None
+        for future in futures:
+            future.add_done_callback(self._on_completion)
+        if timeout is not None and futures:
+            self._timeout_handle = loop.call_later(timeout, self._on_timeout)
+
+    async def wait_for_one(self):
+        while not self._done:
+            await self._waiters.wait()
+        future = self._done.popleft()
+        if future is None:
+            raise TimeoutError
+        return future.result()
+
+    def _on_completion(self, future) -> None:
+        if future not in self._pending:
+            return
+        self._pending.discard(future)
+        self._done.append(future)
+        if not self._pending and self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+        self._waiters.wake_one()
+
+    def _on_timeout(self) -> None:
+        for future in self._pending:
+            future.remove_done_callback(self._on_completion)
+            self._done.append(None)
+        self._pending.clear()
+        self._waiters.wake_all()
+
+
+def gather(*awaitables, return_exceptions: bool = False):
+    children = [_task.ensure_future(awaitable) for awaitable in awaitables]
+    if not children:
+        future = _future.Future(loop=_loop.get_event_loop())
+        future.set_result([])
+        return future
+    return _GatheringFuture(children, return_exceptions, loop=children[0].get_loop())
+
+
+async def wait(futures, *, timeout: tp.Optional[float] = None,
+               return_when: str = ALL_COMPLETED) -> tp.Tuple[tp.Set, tp.Set]:
+    if return_when not in _RETURN_WHEN_VALUES:
+        raise ValueError(f'Invalid return_when value: {return_when!r}')
+    futures = {_task.ensure_future(future) for future in futures}
+    if not futures:
+        raise ValueError('Set of futures is empty')
+    loop = next(iter(futures)).get_loop()
+    num_pending = sum(not future.done() for future in futures)
+    if num_pending and not _is_ready_to_return(futures, num_pending, return_when):
+        await _wait_for_counter(loop, futures, num_pending, timeout, return_when)
+    done = {future for future in futures if future.done()}
+    return done, futures - done
+
+
+async def wait_for(awaitable, timeout: tp.Optional[float]):
+    future = _task.ensure_future(awaitable)
+    if timeout is None:
+        return await future
+    loop = future.get_loop()
+    waiter = loop.create_future()
+    on_done = functools.partial(_release_waiter, waiter)
+    handle = loop.call_later(timeout, on_done)
+    future.add_done_callback(on_done)
+    try:
+        await waiter
+    except _errors.CancelledError:
+        future.remove_done_callback(on_done)
+        future.cancel()
+        raise
+    finally:
+        handle.cancel()
+    if future.done():
+        return future.result()
+    future.remove_done_callback(on_done)
+    future.cancel()
+    await _wait_until_done(loop, future)
+    raise TimeoutError
+
+
+def as_completed(futures, *, timeout: tp.Optional[float] = None) -> tp.Iterator:
+    futures = {_task.ensure_future(future) for future in futures}
+    if not futures:
+        return iter(())
+    queue = _CompletionQueue(next(iter(futures)).get_loop(), futures, timeout)
+    return (queue.wait_for_one() for _ in range(len(futures)))
+
+
+async def _wait_for_counter(loop, futures: tp.Set, num_pending: int,
+                            timeout: tp.Optional[float], return_when: str) -> None:
+    waiter = loop.create_future()
+    counter = _WaitCounter(waiter, num_pending, return_when)
+    handle = None
+    if timeout is not None:
+        handle = loop.call_later(timeout, _release_waiter, waiter)
+    for future in futures:
+        if not future.done():
+            future.add_done_callback(counter)
+    try:
+        await waiter
+    finally:
+        if handle is not None:
+            handle.cancel()
+        for future in futures:
+            future.remove_done_callback(counter)
+
+
+async def _wait_until_done(loop, future) -> None:
+    if future.done():
+        return
+    waiter = loop.create_future()
+    future.add_done_callback(functools.partial(_release_waiter, waiter))
+    await waiter
+
+
+def _is_ready_to_return(futures: tp.Set, num_pending: int, return_when: str) -> bool:
+    if return_when == FIRST_COMPLETED:
+        return num_pending < len(futures)
+    if return_when == FIRST_EXCEPTION:
+        return any(future.done() and _has_failed(future) for future in futures)
+    return False
+
+
+def _has_failed(future) -> bool:
+    return not future.cancelled() and future.exception() is not None
+
+
+def _get_outcome(future):
+    exception = future.exception()
+    if exception is not None:
+        return exception
+    return future.result()
+
+
+def _release_waiter(waiter, *args) -> None:
+    del args  # unused
+    if not waiter.done():
+        waiter.set_result(None)
@@ -4,3 +4,11 @@ class CancelledError(Exception):
 
 class InvalidStateError(Exception):
     pass
+
+
+class QueueEmpty(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
@@ -1,6 +1,7 @@
-import collections
-import contextlib
+import concurrent.futures
+import functools
 import logging
+import typing as tp
 
 from . import _base_future
 from . import _errors
@@ -12,10 +13,13 @@ _MISSING = object()
 
 
 class Future(_base_future.BaseFuture):
+    __slots__ = ('_result', '_exception', '_callback', '_callbacks', '_done', '_cancelled', '_loop')
+
     def __init__(self, *, loop=None):
         self._result = _MISSING
         self._exception: Exception = _MISSING
-        self._callbacks = collections.deque()
+        self._callback = None
+        self._callbacks: tp.Optional[tp.List] = None
         self._done = False
         self._cancelled = False
         if loop is None:
@@ -30,43 +34,51 @@ class Future(_base_future.BaseFuture):
         return self._result
 
     def set_result(self, result) -> None:
-        logger.debug('Setting result of %s to %r', self, result)
-        with self._transition_to_done():
-            self._result = result
-            self._exception = None
+        self._set_result(result)
 
     def exception(self) -> Exception:
         self._require_done()
         return self._exception
 
     def set_exception(self, exception) -> None:
-        logger.debug('Setting exception of %s to %r', self, exception)
-        with self._transition_to_done():
-            self._exception = _build_exception_instance(exception)
+        self._set_exception(exception)
 
     def done(self) -> bool:
         return self._done
 
     def add_done_callback(self, callback) -> None:
-        logger.debug('Adding done callback %s to %s', callback, self)
-        self._callbacks.append(callback)
+        if self._loop._debug:
+            logger.debug('Adding done callback %s to %s', callback, self)
+        if self._callback is None:
+            self._callback = callback
+        elif self._callbacks is None:
+            self._callbacks = [callback]
+        else:
+            self._callbacks.append(callback)
         if self.done():
-            logger.debug('Immediately scheduling callbacks for %s', self)
+            if self._loop._debug:
+                logger.debug('Immediately scheduling callbacks for %s', self)
             self._schedule_callbacks()
 
     def remove_done_callback(self, callback) -> int:
-        new_callbacks = _with_all_occurrences_removed(self._callbacks, callback)
-        num_removed = len(self._callbacks) - len(new_callbacks)
-        self._callbacks = new_callbacks
-        logger.debug('Removed %d callbacks equal to %s from %s', num_removed, callback, self)
+        num_removed = 0
+        if self._callbacks:
+            num_removed = _remove_all_occurrences(self._callbacks, callback)
+        if self._callback is not None and self._callback == callback:
+            num_removed += 1
+            self._callback = self._callbacks.pop(0) if self._callbacks else None
+        if self._loop._debug:
+            logger.debug('Removed %d callbacks equal to %s from %s', num_removed, callback, self)
         return num_removed
 
     def cancel(self) -> bool:
-        logger.debug('Cancelling %s', self)
+        if self._loop._debug:
+            logger.debug('Cancelling %s', self)
         if self.done():
-            logger.debug("Can't cancel %s, because it's already done", self)
+            if self._loop._debug:
+                logger.debug("Can't cancel %s, because it's already done", self)
             return False
-        self.set_exception(_errors.CancelledError)
+        self._set_exception(_errors.CancelledError)
         self._cancelled = True
         return True
 
@@ -83,29 +95,43 @@ class Future(_base_future.BaseFuture):
     def __await__(self):
         return (yield from self)
 
-    def _schedule_callbacks(self):
-        logger.debug('Scheduling callbacks for %s', self)
-        while self._callbacks:
-            self._loop.call_soon(self._callbacks.popleft(), self)
+    def _set_result(self, result) -> None:
+        if self._loop._debug:
+            logger.debug('Setting result of %s to %r', self, result)
+        if self._done:
+            raise _errors.InvalidStateError(f'{self} is already done')
+        self._result = result
+        self._exception = None
+        self._done = True
+        self._schedule_callbacks()
 
-    def _require_not_done(self):
-        if self.done():
+    def _set_exception(self, exception) -> None:
+        if self._loop._debug:
+            logger.debug('Setting exception of %s to %r', self, exception)
+        if self._done:
             raise _errors.InvalidStateError(f'{self} is already done')
+        self._exception = _build_exception_instance(exception)
+        self._done = True
+        self._schedule_callbacks()
+
+    def _schedule_callbacks(self):
+        if self._loop._debug:
+            logger.debug('Scheduling callbacks for %s', self)
+        callback = self._callback
+        if callback is None:
+            return
+        self._callback = None
+        self._loop.call_soon(callback, self)
+        callbacks = self._callbacks
+        if callbacks:
+            self._callbacks = None
+            for callback in callbacks:
+                self._loop.call_soon(callback, self)
 
     def _require_done(self):
         if not self.done():
             raise _errors.InvalidStateError(f'{self} is not done')
 
-    def _mark_as_done(self):
-        self._done = True
-
-    @contextlib.contextmanager
-    def _transition_to_done(self):
-        self._require_not_done()
-        yield
-        self._mark_as_done()
-        self._schedule_callbacks()
-
     def __str__(self) -> str:
         state = self._get_state()
         return f'<Future {state}>'
@@ -127,6 +153,42 @@ class Future(_base_future.BaseFuture):
         return f'result={self._result!r}'
 
 
+def wrap_future(future, *, loop=None) -> Future:
+    if isinstance(future, _base_future.BaseFuture):
+        return future
+    if not isinstance(future, concurrent.futures.Future):
+        raise TypeError(f'{future!r} should be concurrent.futures.Future')
+    aio_future = Future(loop=loop)
+    aio_future.add_done_callback(functools.partial(_cancel_if_cancelled, future))
+    future.add_done_callback(functools.partial(_copy_state_threadsafe, aio_future))
+    return aio_future
+
+
+def _cancel_if_cancelled(concurrent_future: concurrent.futures.Future, future: Future) -> None:
+    if future.cancelled():
+        concurrent_future.cancel()
+
+
+def _copy_state_threadsafe(future: Future, concurrent_future: concurrent.futures.Future) -> None:
+    try:
+        future.get_loop().call_soon_threadsafe(_copy_state, concurrent_future, future)
+    except RuntimeError:
+        logger.debug("Can't copy state of %s, because its loop is closed", concurrent_future)
+
+
+def _copy_state(concurrent_future: concurrent.futures.Future, future: Future) -> None:
+    if future.done():
+        return
+    if concurrent_future.cancelled():
+        future.cancel()
+        return
+    exception = concurrent_future.exception()
+    if exception is None:
+        future.set_result(concurrent_future.result())
+    else:
+        future.set_exception(exception)
+
+
 def _build_exception_instance(exception) -> Exception:
     if isinstance(exception, Exception):
         return exception
@@ -139,9 +201,7 @@ def _is_subclass_of_exception(exception) -> bool:
     return isinstance(exception, type) and issubclass(exception, Exception)
 
 
-def _with_all_occurrences_removed(deque, item):
-    return collections.deque(
-        cur_item
-        for cur_item in deque
-        if cur_item != item
-    )
+def _remove_all_occurrences(items: tp.List, item) -> int:
+    num_items = len(items)
+    items[:] = [cur_item for cur_item in items if cur_item != item]
+    return num_items - len(items)
@@ -0,0 +1,233 @@
+import collections
+import typing as tp
+
+from . import _errors
+from . import _loop
+
+
+class _WaiterQueue:
+    __slots__ = ('_waiters',)
+
+    def __init__(self) -> None:
+        # insertion ordered, so waiters are woken in FIFO order and removed in O(1)
+        self._waiters: tp.Dict[tp.Any, None] = collections.OrderedDict()
+
+    def add(self):
+        future = _loop.get_running_loop().create_future()
+        self._waiters[future] = None
+        return future
+
+    def discard(self, future) -> None:
+        self._waiters.pop(future, None)
+
+    async def wait(self, pass_on: tp.Optional[tp.Callable[[], None]] = None) -> None:
+        future = self.add()
+        try:
+            await future
+        except _errors.CancelledError:
+            if future.done() and not future.cancelled():
+                # the wakeup was meant for us, so don't let it get lost
+                (pass_on or self.wake_one)()
+            raise
+        finally:
+            self.discard(future)
+
+    def wake_one(self, result=None) -> bool:
+        waiters = self._waiters
+        while waiters:
+            future, _ = waiters.popitem(last=False)
+            if not future.done():
+                future.set_result(result)
+                return True
+        return False
+
+    def wake_many(self, num_waiters: int, result=None) -> None:
+        for _ in range(num_waiters):
+            if not self.wake_one(result):
+                break
+
+    def wake_all(self, result=None) -> None:
+        for future in self._waiters:
+            if not future.done():
+                future.set_result(result)
+        self._waiters.clear()
+
+    def __len__(self) -> int:
+        return len(self._waiters)
+
+
+class Lock:
+    def __init__(self) -> None:
+        self._locked = False
+        self._waiters = _WaiterQueue()
+
+    def locked(self) -> bool:
+        return self._locked
+
+    async def acquire(self) -> bool:
+        # release() hands the lock over to a waiter, so an unlocked lock has no waiters
+        if not self._locked:
+            self._locked = True
+            return True
+        await self._waiters.wait(self.release)
+        return True
+
+    def release(self) -> None:
+        if not self._locked:
+            raise RuntimeError('Lock is not acquired')
+        if not self._waiters.wake_one():
+            self._locked = False
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def __str__(self) -> str:
+        state = 'locked' if self._locked else 'unlocked'
+        return f'<Lock {state} waiters={len(self._waiters)}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class Event:
+    def __init__(self) -> None:
+        self._is_set = False
+        self._waiters = _WaiterQueue()
+
+    def is_set(self) -> bool:
+        return self._is_set
+
+    def set(self) -> None:
+        if not self._is_set:
+            self._is_set = True
+            self._waiters.wake_all(True)
+
+    def clear(self) -> None:
+        self._is_set = False
+
+    async def wait(self) -> bool:
+        if self._is_set:
+            return True
+        future = self._waiters.add()
+        try:
+            return await future
+        finally:
+            self._waiters.discard(future)
+
+    def __str__(self) -> str:
+        state = 'set' if self._is_set else 'unset'
+        return f'<Event {state} waiters={len(self._waiters)}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class Condition:
+    def __init__(self, lock: tp.Optional[Lock] = None) -> None:
+        if lock is None:
+            lock = Lock()
+        self._lock = lock
+        self.locked = lock.locked
+        self.acquire = lock.acquire
+        self.release = lock.release
+        self._waiters = _WaiterQueue()
+
+    async def wait(self) -> bool:
+        if not self.locked():
+            raise RuntimeError('Condition lock is not acquired')
+        self.release()
+        try:
+            future = self._waiters.add()
+            try:
+                return await future
+            finally:
+                self._waiters.discard(future)
+        finally:
+            await self._reacquire()
+
+    async def wait_for(self, predicate: tp.Callable[[], tp.Any]):
+        result = predicate()
+        while not result:
+            await self.wait()
+            result = predicate()
+        return result
+
+    def notify(self, num_waiters: int = 1) -> None:
+        if not self.locked():
+            raise RuntimeError('Condition lock is not acquired')
+        self._waiters.wake_many(num_waiters, True)
+
+    def notify_all(self) -> None:
+        self.notify(len(self._waiters))
+
+    async def _reacquire(self) -> None:
+        is_cancelled = False
+        while True:
+            try:
+                await self.acquire()
+                break
+            except _errors.CancelledError:
+                is_cancelled = True
+        if is_cancelled:
+            raise _errors.CancelledError
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def __str__(self) -> str:
+        return f'<Condition lock={self._lock} waiters={len(self._waiters)}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class Semaphore:
+    def __init__(self, value: int = 1) -> None:
+        if value < 0:
+            raise ValueError(f'Semaphore initial value should be >= 0, got {value}')
+        self._value = value
+        self._waiters = _WaiterQueue()
+
+    def locked(self) -> bool:
+        return self._value == 0
+
+    async def acquire(self) -> bool:
+        # release() hands the permit over to a waiter, so a positive value means no waiters
+        if self._value > 0:
+            self._value -= 1
+            return True
+        await self._waiters.wait(self.release)
+        return True
+
+    def release(self) -> None:
+        if not self._waiters.wake_one():
+            self._value += 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def __str__(self) -> str:
+        return f'<{type(self).__name__} value={self._value} waiters={len(self._waiters)}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class BoundedSemaphore(Semaphore):
+    def __init__(self, value: int = 1) -> None:
+        super().__init__(value)
+        self._bound_value = value
+
+    def release(self) -> None:
+        if self._value >= self._bound_value:
+            raise ValueError('BoundedSemaphore is released too many times')
+        super().release()
@@ -1,45 +1,51 @@
 import collections
-import heapq
+import concurrent.futures
+import functools
 import inspect
 import logging
+import selectors
+import socket
+import threading
 import time
 import typing as tp
-from dataclasses import dataclass
 
-logger = logging.getLogger(__name__)
+from . import _timers
 
-_SOON_CALLBACK_LEVEL = 0
-_DELAYED_CALLBACK_LEVEL = 1
+logger = logging.getLogger(__name__)
 
 _MISSING = object()
 
+_DEFAULT_BACKLOG = 100
 
-@dataclass(frozen=True, order=True)
-class _Priority:
-    level: int
-    when: float
-    index: int
+# callbacks-per-iteration are bucketed by bit length, so it's enough for any deque size
+_NUM_HISTOGRAM_BUCKETS = 64
 
 
-class _Callback:
+class Handle:
+    __slots__ = ('_function', '_args', '_cancelled', '_loop')
+
     def __init__(
             self,
             function: tp.Callable,
-            args: tp.Tuple) -> None:
+            args: tp.Tuple,
+            loop: tp.Optional['Loop'] = None) -> None:
         self._function = function
         self._args = args
         self._cancelled = False
-
-    def cancelled(self) -> bool:
-        return self._cancelled
+        self._loop = loop
 
     def cancel(self) -> None:
-        logger.debug('Cancelling %s', self)
+        if self._loop is not None and self._loop._debug:
+            logger.debug('Cancelling %s', self)
         self._cancelled = True
 
-    def __call__(self):
-        if self.cancelled():
-            logger.debug('Skipping call of cancelled %s', self)
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def _run(self):
+        if self._cancelled:
+            if self._loop is not None and self._loop._debug:
+                logger.debug('Skipping call of cancelled %s', self)
         else:
             return self._function(*self._args)
 
@@ -57,34 +63,42 @@ class _Callback:
         return ', '.join(map(repr, self._args))
 
 
-_Queue = tp.List[tp.Tuple[_Priority, _Callback]]
-
+class TimerHandle(Handle):
+    __slots__ = ('_when', '_scheduled')
 
-class Handle:
-    def __init__(self, callback: _Callback) -> None:
-        self._callback = callback
+    def __init__(
+            self,
+            function: tp.Callable,
+            args: tp.Tuple,
+            when: float,
+            loop: tp.Optional['Loop'] = None) -> None:
+        super().__init__(function, args, loop)
+        self._when = when
+        self._scheduled = False
 
     def cancel(self) -> None:
-        self._callback.cancel()
-
-    def cancelled(self) -> bool:
-        return self._callback.cancelled()
-
-
-class TimerHandle(Handle):
-    def __init__(self, callback: _Callback, when: float) -> None:
-        super().__init__(callback)
-        self._when = when
+        if self._cancelled:
+            return
+        super().cancel()
+        if self._loop is not None:
+            self._loop._timer_handle_cancelled(self)
 
     def when(self) -> float:
         return self._when
 
 
 class Loop:
-    def __init__(self):
-        self._queue: _Queue = []
-        self._pending_callbacks: tp.Deque[_Callback] = collections.deque()
-        self._callbacks_counter = 0
+    def __init__(self, *, timers: str = _timers.HEAP):
+        self._ready: tp.Deque[Handle] = collections.deque()
+        self._scheduled = _timers.new_timers(timers, self.time())
+        self._pending_callbacks: tp.Deque[Handle] = collections.deque()
+        self._selector = selectors.DefaultSelector()
+
+        self._threadsafe_callbacks: tp.Deque[Handle] = collections.deque()
+        self._threadsafe_lock = threading.Lock()
+        # created on the first call_soon_threadsafe(), most loops never need them
+        self._wakeup_reader: tp.Optional[socket.socket] = None
+        self._wakeup_writer: tp.Optional[socket.socket] = None
 
         self._is_running = False
         self._is_closed = False
@@ -93,13 +107,27 @@ class Loop:
         self._all_tasks = set()
 
         self._exception_handler = _default_exception_handler
+        self._default_executor: tp.Optional[concurrent.futures.Executor] = None
+
+        self._debug = False
+
+        self._callbacks_histogram = [0] * _NUM_HISTOGRAM_BUCKETS
 
     def call_soon(self, callback, *args) -> Handle:
         self._require_not_is_closed()
-        priority = self._build_soon_priority()
-        callback = _Callback(callback, args)
-        self._add_callback(priority, callback)
-        return Handle(callback)
+        handle = Handle(callback, args, self)
+        self._add_ready_callback(handle)
+        return handle
+
+    def call_soon_threadsafe(self, callback, *args) -> Handle:
+        handle = Handle(callback, args, self)
+        with self._threadsafe_lock:
+            self._require_not_is_closed()
+            if self._wakeup_writer is None:
+                self._open_wakeup_sockets()
+            self._threadsafe_callbacks.append(handle)
+        self._wake_up()
+        return handle
 
     def call_later(self, delay, callback, *args) -> TimerHandle:
         self._require_not_is_closed()
@@ -108,10 +136,114 @@ class Loop:
 
     def call_at(self, when, callback, *args) -> TimerHandle:
         self._require_not_is_closed()
-        priority = self._build_delayed_priority(when)
-        callback = _Callback(callback, args)
-        self._add_callback(priority, callback)
-        return TimerHandle(callback, priority.when)
+        handle = TimerHandle(callback, args, when, self)
+        self._add_scheduled_callback(handle)
+        return handle
+
+    def run_in_executor(self, executor, function, *args):
+        from . import _future
+        self._require_not_is_closed()
+        if executor is None:
+            executor = self._get_default_executor()
+        return _future.wrap_future(executor.submit(function, *args), loop=self)
+
+    def set_default_executor(self, executor: concurrent.futures.Executor) -> None:
+        logger.debug('Setting default executor of %s to %s', self, executor)
+        self._default_executor = executor
+
+    def create_future(self):
+        from . import _future
+        return _future.Future(loop=self)
+
+    def create_task(self, coro):
+        from . import _task
+        return _task.Task(coro, loop=self)
+
+    def sock_recv(self, sock: socket.socket, num_bytes: int):
+        return self._sock_operation(sock, selectors.EVENT_READ, sock.recv, num_bytes)
+
+    def sock_recv_into(self, sock: socket.socket, buffer):
+        return self._sock_operation(sock, selectors.EVENT_READ, sock.recv_into, buffer)
+
+    def sock_accept(self, sock: socket.socket):
+        return self._sock_operation(sock, selectors.EVENT_READ, _accept_nonblocking, sock)
+
+    def sock_sendall(self, sock: socket.socket, data):
+        future = self.create_future()
+        self._sock_send_rest(future, sock, memoryview(data), False)
+        return future
+
+    def sock_connect(self, sock: socket.socket, address):
+        future = self.create_future()
+        try:
+            sock.connect(address)
+        except (BlockingIOError, InterruptedError):
+            self._wait_for_sock(
+                future, sock, selectors.EVENT_WRITE, self._finish_sock_connect,
+                (future, sock, address))
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(None)
+        return future
+
+    def getaddrinfo(self, host, port, *, family=0, type=0, proto=0, flags=0):
+        try:
+            # numeric hosts are resolved without blocking, so there's no need for a thread
+            infos = socket.getaddrinfo(
+                host, port, family, type, proto, flags | socket.AI_NUMERICHOST)
+        except socket.gaierror:
+            return self.run_in_executor(
+                None, functools.partial(
+                    socket.getaddrinfo, host, port, family, type, proto, flags))
+        future = self.create_future()
+        future.set_result(infos)
+        return future
+
+    async def create_connection(self, protocol_factory, host=None, port=None, *, sock=None):
+        from . import _transports
+        if sock is None:
+            sock = await self._connect_to_any(host, port)
+        sock.setblocking(False)
+        waiter = self.create_future()
+        protocol = protocol_factory()
+        transport = _transports.Transport(self, sock, protocol, waiter)
+        try:
+            await waiter
+        except Exception:
+            transport.close()
+            raise
+        return transport, protocol
+
+    async def create_server(
+            self, protocol_factory, host=None, port=None, *,
+            backlog: int = _DEFAULT_BACKLOG, reuse_port: bool = False):
+        from . import _transports
+        infos = await self.getaddrinfo(
+            host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)
+        sockets = []
+        try:
+            for family, type_, proto, _, sockaddr in infos:
+                sockets.append(_listen(family, type_, proto, sockaddr, backlog, reuse_port))
+        except Exception:
+            for sock in sockets:
+                sock.close()
+            raise
+        server = _transports.Server(self, sockets, protocol_factory, backlog)
+        server.start_serving()
+        return server
+
+    def add_reader(self, fd, callback, *args) -> Handle:
+        return self._add_io_callback(fd, selectors.EVENT_READ, callback, args)
+
+    def remove_reader(self, fd) -> bool:
+        return self._remove_io_callback(fd, selectors.EVENT_READ)
+
+    def add_writer(self, fd, callback, *args) -> Handle:
+        return self._add_io_callback(fd, selectors.EVENT_WRITE, callback, args)
+
+    def remove_writer(self, fd) -> bool:
+        return self._remove_io_callback(fd, selectors.EVENT_WRITE)
 
     # noinspection PyMethodMayBeStatic
     def time(self) -> float:
@@ -129,9 +261,11 @@ class Loop:
         self._require_not_is_closed()
         logger.debug('Running %s forever', self)
         self._is_running = True
+        callbacks_histogram = self._callbacks_histogram
         while self._is_running:
             self._wait_for_next_callback()
-            self._prepare_pending_callbacks()
+            num_callbacks = self._prepare_pending_callbacks()
+            callbacks_histogram[num_callbacks.bit_length()] += 1
             self._call_pending_callbacks()
 
     def run_until_complete(self, future):
@@ -150,7 +284,14 @@ class Loop:
     def close(self):
         self._require_not_is_running()
         logger.debug('Closing %s', self)
-        self._is_closed = True
+        with self._threadsafe_lock:
+            self._is_closed = True
+        self._selector.close()
+        if self._wakeup_writer is not None:
+            self._wakeup_reader.close()
+            self._wakeup_writer.close()
+        if self._default_executor is not None:
+            self._default_executor.shutdown(wait=False)
 
     def is_closed(self) -> bool:
         return self._is_closed
@@ -159,6 +300,23 @@ class Loop:
         logger.debug('Setting exception_handler of %s to %s', self, exception_handler)
         self._exception_handler = exception_handler
 
+    def get_debug(self) -> bool:
+        return self._debug
+
+    def set_debug(self, enabled: bool) -> None:
+        self._debug = enabled
+
+    def get_num_iterations(self) -> int:
+        return sum(self._callbacks_histogram)
+
+    def get_callbacks_histogram(self) -> tp.Dict[int, int]:
+        # maps the max number of callbacks in a bucket to the number of iterations in it
+        return {
+            (1 << index) - 1: count
+            for index, count in enumerate(self._callbacks_histogram)
+            if count
+        }
+
     def current_task(self):
         return self._current_task
 
@@ -170,48 +328,200 @@ class Loop:
 
     def add_task(self, task):
         self._all_tasks.add(task)
-        task.add_done_callback(lambda _: self._all_tasks.remove(task))
+
+    def remove_task(self, task):
+        self._all_tasks.discard(task)
 
     def _require_not_is_running(self):
         if self.is_running():
             raise RuntimeError('Event loop is running')
 
-    def _build_soon_priority(self) -> _Priority:
-        return _Priority(
-            level=_SOON_CALLBACK_LEVEL,
-            when=self.time(),
-            index=self._callbacks_counter)
+    def _get_default_executor(self) -> concurrent.futures.Executor:
+        if self._default_executor is None:
+            self._default_executor = concurrent.futures.ThreadPoolExecutor()
+        return self._default_executor
 
-    def _build_delayed_priority(self, when: float) -> _Priority:
-        return _Priority(
-            level=_DELAYED_CALLBACK_LEVEL,
-            when=when,
-            index=self._callbacks_counter)
+    def _add_io_callback(self, fd, event: int, function, args) -> Handle:
+        self._require_not_is_closed()
+        handle = Handle(function, args, self)
+        try:
+            key = self._selector.get_key(fd)
+        except KeyError:
+            if self._debug:
+                logger.debug('Registering %s for fd %r in %s', handle, fd, self)
+            self._selector.register(fd, event, {event: handle})
+        else:
+            if self._debug:
+                logger.debug('Replacing callbacks for fd %r in %s with %s', fd, self, handle)
+            callbacks = dict(key.data)
+            callbacks[event] = handle
+            self._selector.modify(fd, key.events | event, callbacks)
+        return handle
+
+    def _remove_io_callback(self, fd, event: int) -> bool:
+        if self.is_closed():
+            return False
+        try:
+            key = self._selector.get_key(fd)
+        except KeyError:
+            return False
+        if not key.events & event:
+            return False
+        if self._debug:
+            logger.debug('Removing callback for fd %r from %s', fd, self)
+        callbacks = dict(key.data)
+        callbacks.pop(event).cancel()
+        events = key.events & ~event
+        if events:
+            self._selector.modify(fd, events, callbacks)
+        else:
+            self._selector.unregister(fd)
+        return True
+
+    def _sock_operation(self, sock: socket.socket, event: int, function, *args):
+        future = self.create_future()
+        try:
+            result = function(*args)
+        except (BlockingIOError, InterruptedError):
+            self._wait_for_sock(
+                future, sock, event, self._retry_sock_operation,
+                (future, sock.fileno(), event, function, args))
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+        return future
+
+    def _wait_for_sock(self, future, sock: socket.socket, event: int, callback, args) -> None:
+        fd = sock.fileno()
+        self._add_io_callback(fd, event, callback, args)
+        future.add_done_callback(functools.partial(self._stop_waiting_for_sock, fd, event))
+
+    def _stop_waiting_for_sock(self, fd: int, event: int, future) -> None:
+        if future.cancelled():
+            self._remove_io_callback(fd, event)
+
+    def _retry_sock_operation(self, future, fd: int, event: int, function, args) -> None:
+        if future.done():
+            return
+        try:
+            result = function(*args)
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as exc:
+            self._remove_io_callback(fd, event)
+            future.set_exception(exc)
+        else:
+            self._remove_io_callback(fd, event)
+            future.set_result(result)
+
+    def _sock_send_rest(self, future, sock: socket.socket, view: memoryview,
+                        is_waiting: bool) -> None:
+        if future.done():
+            return
+        try:
+            num_sent = sock.send(view)
+        except (BlockingIOError, InterruptedError):
+            num_sent = 0
+        except Exception as exc:
+            if is_waiting:
+                self.remove_writer(sock.fileno())
+            future.set_exception(exc)
+            return
+        view = view[num_sent:]
+        if not view:
+            if is_waiting:
+                self.remove_writer(sock.fileno())
+            future.set_result(None)
+        elif not is_waiting:
+            self._wait_for_sock(
+                future, sock, selectors.EVENT_WRITE, self._sock_send_rest,
+                (future, sock, view, True))
+        elif num_sent:
+            self.add_writer(sock.fileno(), self._sock_send_rest, future, sock, view, True)
+
+    def _finish_sock_connect(self, future, sock: socket.socket, address) -> None:
+        self.remove_writer(sock.fileno())
+        if future.done():
+            return
+        error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            future.set_exception(OSError(error, f'Connect call failed {address}'))
+        else:
+            future.set_result(None)
+
+    async def _connect_to_any(self, host, port) -> socket.socket:
+        infos = await self.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        if not infos:
+            raise OSError(f'getaddrinfo({host!r}, {port!r}) returned empty list')
+        last_exc = None
+        for family, type_, proto, _, sockaddr in infos:
+            sock = socket.socket(family, type_, proto)
+            try:
+                sock.setblocking(False)
+                await self.sock_connect(sock, sockaddr)
+            except Exception as exc:
+                sock.close()
+                last_exc = exc
+            else:
+                return sock
+        raise last_exc
 
     def _wait_for_next_callback(self):
         pause = self._get_pause_till_next_callback()
-        if pause > 0:
-            logger.debug('Waiting %.3f seconds for next callback', pause)
-            time.sleep(pause)
-
-    def _prepare_pending_callbacks(self):
+        if self._debug and pause != 0:
+            logger.debug('Waiting %s seconds for next callback', pause)
+        ready = self._selector.select(timeout=pause)
+        for key, events in ready:
+            self._add_io_ready_callbacks(key, events)
+        if self._threadsafe_callbacks:
+            self._move_threadsafe_callbacks()
+
+    def _move_threadsafe_callbacks(self) -> None:
+        with self._threadsafe_lock:
+            self._ready.extend(self._threadsafe_callbacks)
+            self._threadsafe_callbacks.clear()
+
+    def _open_wakeup_sockets(self) -> None:
+        self._wakeup_reader, self._wakeup_writer = _make_wakeup_sockets()
+        self.add_reader(self._wakeup_reader.fileno(), self._read_wakeups)
+
+    def _wake_up(self) -> None:
+        try:
+            self._wakeup_writer.send(b'\0')
+        except OSError:
+            # the buffer is full, so the loop is going to wake up anyway
+            pass
+
+    def _read_wakeups(self) -> None:
+        try:
+            while self._wakeup_reader.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def _add_io_ready_callbacks(self, key: selectors.SelectorKey, events: int) -> None:
+        for event, callback in key.data.items():
+            if events & event and not callback.cancelled():
+                self._add_ready_callback(callback)
+
+    def _prepare_pending_callbacks(self) -> int:
         assert not self._pending_callbacks
-        now = self.time()
-        while self._has_ready_callback(now):
-            callback = self._pop_ready_callback()
-            self._pending_callbacks.append(callback)
-
-    def _pop_ready_callback(self) -> _Callback:
-        _, callback = heapq.heappop(self._queue)
-        return callback
+        pending = self._ready
+        self._ready = self._pending_callbacks
+        self._pending_callbacks = pending
+        self._scheduled.pop_ready(self.time(), pending)
+        return len(pending)
 
     def _call_pending_callbacks(self):
-        logger.debug('Calling %d pending callbacks', len(self._pending_callbacks))
-        while self._pending_callbacks:
-            callback = self._pending_callbacks.popleft()
-            # noinspection PyBroadException
+        pending = self._pending_callbacks
+        if self._debug:
+            logger.debug('Calling %d pending callbacks', len(pending))
+        while pending:
+            # the inner loop keeps the try block out of the per-callback path
             try:
-                callback()
+                while pending:
+                    pending.popleft()._run()
             except Exception as exc:
                 context = {
                     'message': str(exc),
@@ -223,40 +533,50 @@ class Loop:
         if self.is_closed():
             raise RuntimeError('Event loop is closed')
 
-    def _has_ready_callback(self, now: float) -> bool:
-        if not self._queue:
-            return False
-        return self._get_when_of_next_callback() <= now
+    def _get_pause_till_next_callback(self) -> tp.Optional[float]:
+        if self._ready or self._threadsafe_callbacks:
+            return 0.0
+        when = self._scheduled.next_when()
+        if when is None:
+            return None
+        return max(0.0, when - self.time())
 
-    def _get_pause_till_next_callback(self):
-        if not self._queue:
-            return 1.0
-        return max(0.0, self._get_when_of_next_callback() - self.time())
+    def _call_handle_soon(self, handle: Handle) -> None:
+        self._require_not_is_closed()
+        self._add_ready_callback(handle)
+
+    def _add_ready_callback(self, callback: Handle) -> None:
+        if self._debug:
+            logger.debug('Adding %s to %s', callback, self)
+        self._ready.append(callback)
 
-    def _get_when_of_next_callback(self):
-        priority, _ = self._queue[0]
-        return priority.when
+    def _add_scheduled_callback(self, callback: TimerHandle) -> None:
+        if self._debug:
+            logger.debug('Adding %s to %s', callback, self)
+        self._scheduled.add(callback)
 
-    def _add_callback(self, priority: _Priority, callback: _Callback) -> None:
-        logger.debug('Adding %s to %s', callback, self)
-        heapq.heappush(self._queue, (priority, callback))
-        self._callbacks_counter += 1
+    def _timer_handle_cancelled(self, callback: TimerHandle) -> None:
+        self._scheduled.remove(callback)
 
     def __str__(self):
         state = 'running' if self._is_running else 'pending'
         return f'<Loop {state}>'
 
 
-_loop: Loop = _MISSING
+class _LoopRegistry(threading.local):
+    loop: tp.Optional[Loop] = _MISSING
+
+
+_registry = _LoopRegistry()
 
 
 def get_event_loop() -> Loop:
-    if _loop is None:
+    if _registry.loop is None:
         raise RuntimeError('Event loop is unset for this context')
-    if _loop is _MISSING:
+    if _registry.loop is _MISSING:
         logger.debug("Event loop doesn't exists for this context, creating a new one")
         set_event_loop(new_event_loop())
-    return _loop
+    return _registry.loop
 
 
 def new_event_loop() -> Loop:
@@ -264,16 +584,16 @@ def new_event_loop() -> Loop:
 
 
 def set_event_loop(loop: tp.Optional[Loop]) -> None:
-    global _loop
-    _loop = loop
+    _registry.loop = loop
 
 
 def get_running_loop() -> Loop:
-    if (_loop is None) or (_loop is _MISSING):
+    loop = _registry.loop
+    if (loop is None) or (loop is _MISSING):
         raise RuntimeError('No running loop')
-    if not _loop.is_running():
+    if not loop.is_running():
         raise RuntimeError('No running loop')
-    return _loop
+    return loop
 
 
 def run(coro):
@@ -288,6 +608,36 @@ def run(coro):
         set_event_loop(None)
 
 
+def _make_wakeup_sockets() -> tp.Tuple[socket.socket, socket.socket]:
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    writer.setblocking(False)
+    return reader, writer
+
+
+def _accept_nonblocking(sock: socket.socket):
+    conn, address = sock.accept()
+    conn.setblocking(False)
+    return conn, address
+
+
+def _listen(family, type_, proto, sockaddr, backlog: int, reuse_port: bool) -> socket.socket:
+    sock = socket.socket(family, type_, proto)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        if family == socket.AF_INET6:
+            sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+        sock.bind(sockaddr)
+        sock.listen(backlog)
+        sock.setblocking(False)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
 def _default_exception_handler(loop, context: dict) -> None:
     del loop  # unused
     logger.error('Got an exception: %s', context['message'], exc_info=True)
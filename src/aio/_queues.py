@@ -0,0 +1,142 @@
+import collections
+import heapq
+import typing as tp
+
+from . import _errors
+from . import _locks
+
+
+class Queue:
+    def __init__(self, maxsize: int = 0) -> None:
+        self._maxsize = maxsize
+        self._getters = _locks._WaiterQueue()
+        self._putters = _locks._WaiterQueue()
+        self._num_unfinished = 0
+        self._finished = _locks.Event()
+        self._finished.set()
+        self._init(maxsize)
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def qsize(self) -> int:
+        return len(self._queue)
+
+    def empty(self) -> bool:
+        return not self._queue
+
+    def full(self) -> bool:
+        return 0 < self._maxsize <= self.qsize()
+
+    async def put(self, item) -> None:
+        while self.full():
+            await self._putters.wait(self._wake_putter)
+        self.put_nowait(item)
+
+    def put_nowait(self, item) -> None:
+        if self.full():
+            raise _errors.QueueFull
+        self._put(item)
+        self._on_put(1)
+
+    async def put_many(self, items: tp.Iterable) -> None:
+        # consumers are woken once per batch instead of once per item
+        num_put = 0
+        for item in items:
+            while self.full():
+                if num_put:
+                    self._on_put(num_put)
+                    num_put = 0
+                await self._putters.wait(self._wake_putter)
+            self._put(item)
+            num_put += 1
+        if num_put:
+            self._on_put(num_put)
+
+    async def get(self):
+        while self.empty():
+            await self._getters.wait(self._wake_getter)
+        return self.get_nowait()
+
+    def get_nowait(self):
+        if self.empty():
+            raise _errors.QueueEmpty
+        item = self._get()
+        self._putters.wake_one()
+        return item
+
+    async def get_many(self, max_items: int) -> tp.List:
+        if max_items < 1:
+            raise ValueError(f'max_items should be >= 1, got {max_items}')
+        while self.empty():
+            await self._getters.wait(self._wake_getter)
+        get = self._get
+        items = [get() for _ in range(min(max_items, self.qsize()))]
+        self._putters.wake_many(len(items))
+        return items
+
+    def task_done(self, num_items: int = 1) -> None:
+        if num_items > self._num_unfinished:
+            raise ValueError('task_done() called too many times')
+        self._num_unfinished -= num_items
+        if not self._num_unfinished:
+            self._finished.set()
+
+    async def join(self) -> None:
+        await self._finished.wait()
+
+    def _on_put(self, num_items: int) -> None:
+        self._num_unfinished += num_items
+        self._finished.clear()
+        self._getters.wake_many(num_items)
+
+    def _wake_putter(self) -> None:
+        if not self.full():
+            self._putters.wake_one()
+
+    def _wake_getter(self) -> None:
+        if not self.empty():
+            self._getters.wake_one()
+
+    def _init(self, maxsize: int) -> None:
+        del maxsize  # unused
+        self._queue = collections.deque()
+
+    def _put(self, item) -> None:
+        self._queue.append(item)
+
+    def _get(self):
+        return self._queue.popleft()
+
+    def __str__(self) -> str:
+        return (f'<{type(self).__name__} maxsize={self._maxsize} size={self.qsize()} '
+                f'getters={len(self._getters)} putters={len(self._putters)}>')
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class LifoQueue(Queue):
+    def _init(self, maxsize: int) -> None:
+        del maxsize  # unused
+        self._queue = []
+
+    def _put(self, item) -> None:
+        self._queue.append(item)
+
+    def _get(self):
+        return self._queue.pop()
+
+
+class PriorityQueue(Queue):
+    def _init(self, maxsize: int) -> None:
+        del maxsize  # unused
+        self._queue = []
+
+    def _put(self, item) -> None:
+        heapq.heappush(self._queue, item)
+
+    def _get(self):
+        return heapq.heappop(self._queue)
+
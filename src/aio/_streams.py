@@ -0,0 +1,303 @@
+import inspect
+import typing as tp
+
+from . import _loop
+from . import _transports
+
+_DEFAULT_LIMIT = 64 * 1024
+
+
+class IncompleteReadError(EOFError):
+    def __init__(self, partial: bytes, expected: tp.Optional[int]) -> None:
+        super().__init__(f'{len(partial)} bytes read on a total of {expected} expected bytes')
+        self.partial = partial
+        self.expected = expected
+
+
+class LimitOverrunError(Exception):
+    def __init__(self, message: str, consumed: int) -> None:
+        super().__init__(message)
+        self.consumed = consumed
+
+
+class StreamReader:
+    def __init__(self, limit: int = _DEFAULT_LIMIT, loop=None) -> None:
+        if limit <= 0:
+            raise ValueError(f'Limit should be positive, got {limit}')
+        if loop is None:
+            loop = _loop.get_event_loop()
+        self._loop = loop
+        self._limit = limit
+        self._buffer = bytearray()
+        self._is_eof = False
+        self._exception: tp.Optional[Exception] = None
+        self._waiter = None
+        self._transport = None
+        self._is_paused = False
+
+    def set_transport(self, transport) -> None:
+        self._transport = transport
+
+    def feed_data(self, data: bytes) -> None:
+        self._buffer.extend(data)
+        self._wake_up_waiter()
+        if (self._transport is not None and not self._is_paused
+                and len(self._buffer) > 2 * self._limit):
+            self._is_paused = True
+            self._transport.pause_reading()
+
+    def feed_eof(self) -> None:
+        self._is_eof = True
+        self._wake_up_waiter()
+
+    def at_eof(self) -> bool:
+        return self._is_eof and not self._buffer
+
+    def exception(self) -> tp.Optional[Exception]:
+        return self._exception
+
+    def set_exception(self, exception: Exception) -> None:
+        self._exception = exception
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.cancelled():
+                waiter.set_exception(exception)
+
+    async def read(self, num_bytes: int = -1) -> bytes:
+        if num_bytes == 0:
+            return b''
+        if num_bytes < 0:
+            chunks = []
+            chunk = await self.read(self._limit)
+            while chunk:
+                chunks.append(chunk)
+                chunk = await self.read(self._limit)
+            return b''.join(chunks)
+        if not self._buffer and not self._is_eof:
+            await self._wait_for_data()
+        data = bytes(self._buffer[:num_bytes])
+        del self._buffer[:num_bytes]
+        self._maybe_resume_transport()
+        return data
+
+    async def readexactly(self, num_bytes: int) -> bytes:
+        if num_bytes < 0:
+            raise ValueError(f'Expected non-negative number of bytes, got {num_bytes}')
+        while len(self._buffer) < num_bytes:
+            if self._is_eof:
+                partial = bytes(self._buffer)
+                self._buffer.clear()
+                raise IncompleteReadError(partial, num_bytes)
+            await self._wait_for_data()
+        data = bytes(self._buffer[:num_bytes])
+        del self._buffer[:num_bytes]
+        self._maybe_resume_transport()
+        return data
+
+    async def readuntil(self, separator: bytes = b'\n') -> bytes:
+        if not separator:
+            raise ValueError('Separator should be non-empty')
+        start = 0
+        while True:
+            index = self._buffer.find(separator, start)
+            if index != -1:
+                break
+            start = max(0, len(self._buffer) - len(separator) + 1)
+            if start > self._limit:
+                raise LimitOverrunError(
+                    'Separator is not found, and chunk exceeds the limit', start)
+            if self._is_eof:
+                partial = bytes(self._buffer)
+                self._buffer.clear()
+                raise IncompleteReadError(partial, None)
+            await self._wait_for_data()
+        if index > self._limit:
+            raise LimitOverrunError('Separator is found, but chunk exceeds the limit', index)
+        end = index + len(separator)
+        data = bytes(self._buffer[:end])
+        del self._buffer[:end]
+        self._maybe_resume_transport()
+        return data
+
+    async def readline(self) -> bytes:
+        try:
+            return await self.readuntil(b'\n')
+        except IncompleteReadError as exc:
+            return exc.partial
+        except LimitOverrunError as exc:
+            if self._buffer.startswith(b'\n', exc.consumed):
+                del self._buffer[:exc.consumed + 1]
+            else:
+                self._buffer.clear()
+            self._maybe_resume_transport()
+            raise ValueError(exc.args[0]) from exc
+
+    def _maybe_resume_transport(self) -> None:
+        if self._is_paused and len(self._buffer) <= self._limit:
+            self._is_paused = False
+            self._transport.resume_reading()
+
+    async def _wait_for_data(self) -> None:
+        if self._exception is not None:
+            raise self._exception
+        if self._waiter is not None:
+            raise RuntimeError(f'{self} is already being read by another coroutine')
+        if self._is_paused:
+            # the caller needs more than what's buffered, so reading has to go on
+            self._is_paused = False
+            self._transport.resume_reading()
+        self._waiter = self._loop.create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
+
+    def _wake_up_waiter(self) -> None:
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.cancelled():
+                waiter.set_result(None)
+
+    def __str__(self) -> str:
+        return f'<StreamReader buffer={len(self._buffer)} eof={self._is_eof}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class StreamReaderProtocol(_transports.Protocol):
+    def __init__(self, reader: StreamReader, client_connected_cb=None, loop=None) -> None:
+        if loop is None:
+            loop = _loop.get_event_loop()
+        self._loop = loop
+        self._reader = reader
+        self._client_connected_cb = client_connected_cb
+        self._transport = None
+        self._is_paused = False
+        self._drain_waiters = []
+        self._is_connection_lost = False
+        self._closed = loop.create_future()
+
+    def connection_made(self, transport) -> None:
+        self._transport = transport
+        self._reader.set_transport(transport)
+        if self._client_connected_cb is not None:
+            writer = StreamWriter(transport, self, self._reader, self._loop)
+            result = self._client_connected_cb(self._reader, writer)
+            if inspect.iscoroutine(result):
+                self._loop.create_task(result)
+
+    def connection_lost(self, exc: tp.Optional[Exception]) -> None:
+        self._is_connection_lost = True
+        if exc is None:
+            self._reader.feed_eof()
+        else:
+            self._reader.set_exception(exc)
+        if not self._closed.done():
+            self._closed.set_result(None)
+        self._wake_up_drain_waiters(exc)
+
+    def data_received(self, data: bytes) -> None:
+        self._reader.feed_data(data)
+
+    def eof_received(self) -> bool:
+        self._reader.feed_eof()
+        return True
+
+    def pause_writing(self) -> None:
+        self._is_paused = True
+
+    def resume_writing(self) -> None:
+        self._is_paused = False
+        self._wake_up_drain_waiters(None)
+
+    async def _drain_helper(self) -> None:
+        if self._is_connection_lost:
+            raise ConnectionResetError('Connection lost')
+        if not self._is_paused:
+            return
+        waiter = self._loop.create_future()
+        self._drain_waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            self._drain_waiters.remove(waiter)
+
+    def _wake_up_drain_waiters(self, exc: tp.Optional[Exception]) -> None:
+        for waiter in self._drain_waiters:
+            if waiter.done():
+                continue
+            if exc is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(exc)
+
+
+class StreamWriter:
+    def __init__(self, transport, protocol: StreamReaderProtocol,
+                 reader: tp.Optional[StreamReader], loop) -> None:
+        self._transport = transport
+        self._protocol = protocol
+        self._reader = reader
+        self._loop = loop
+
+    @property
+    def transport(self):
+        return self._transport
+
+    def write(self, data) -> None:
+        self._transport.write(data)
+
+    def writelines(self, lines) -> None:
+        self._transport.writelines(lines)
+
+    def write_eof(self) -> None:
+        self._transport.write_eof()
+
+    def can_write_eof(self) -> bool:
+        return self._transport.can_write_eof()
+
+    def close(self) -> None:
+        self._transport.close()
+
+    def is_closing(self) -> bool:
+        return self._transport.is_closing()
+
+    async def wait_closed(self) -> None:
+        await self._protocol._closed
+
+    def get_extra_info(self, name: str, default=None):
+        return self._transport.get_extra_info(name, default)
+
+    async def drain(self) -> None:
+        if self._reader is not None and self._reader.exception() is not None:
+            raise self._reader.exception()
+        await self._protocol._drain_helper()
+
+    def __str__(self) -> str:
+        return f'<StreamWriter transport={self._transport}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+async def open_connection(host=None, port=None, *, limit: int = _DEFAULT_LIMIT, **kwargs):
+    loop = _loop.get_running_loop()
+    reader = StreamReader(limit=limit, loop=loop)
+    protocol = StreamReaderProtocol(reader, loop=loop)
+    transport, _ = await loop.create_connection(lambda: protocol, host, port, **kwargs)
+    writer = StreamWriter(transport, protocol, reader, loop)
+    return reader, writer
+
+
+async def start_server(client_connected_cb, host=None, port=None, *,
+                       limit: int = _DEFAULT_LIMIT, **kwargs):
+    loop = _loop.get_running_loop()
+
+    def factory():
+        reader = StreamReader(limit=limit, loop=loop)
+        return StreamReaderProtocol(reader, client_connected_cb, loop=loop)
+
+    return await loop.create_server(factory, host, port, **kwargs)
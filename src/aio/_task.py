@@ -1,5 +1,6 @@
 import inspect
 import logging
+import types
 import typing as tp
 
 from . import _base_future
@@ -33,62 +34,52 @@ def all_tasks(loop=None):
     return loop.all_tasks()
 
 
-class Task(_base_future.BaseFuture):
+async def sleep(delay: float, result=None):
+    if delay <= 0:
+        await _yield_to_loop()
+        return result
+    loop = _loop.get_running_loop()
+    future = loop.create_future()
+    handle = loop.call_later(delay, _set_result_unless_done, future, result)
+    try:
+        return await future
+    finally:
+        handle.cancel()
+
+
+class Task(_future.Future):
+    __slots__ = (
+        '_coro', '_state', '_aio_future_blocking', '_needs_to_force_cancel', '_run_handle')
+
     def __init__(self, coro, *, loop=None):
+        super().__init__(loop=loop)
         self._coro = coro
         self._state = 'pending'
-        self._future = _future.Future()
         self._aio_future_blocking: tp.Optional[_base_future.BaseFuture] = None
         self._needs_to_force_cancel = False
-        if loop is None:
-            loop = _loop.get_event_loop()
-        self._loop = loop
+        # reused every time the coroutine yields bare None, e.g. in sleep(0)
+        self._run_handle = _loop.Handle(self._run, (), self._loop)
         self._loop.add_task(self)
-        self._loop.call_soon(self._run)
-        logger.debug('Created %s', self)
-
-    def result(self) -> object:
-        return self._future.result()
+        self._loop._call_handle_soon(self._run_handle)
+        if self._loop._debug:
+            logger.debug('Created %s', self)
 
     def set_result(self, result) -> None:
         raise RuntimeError(f"{self} doesn't support set_result()")
 
-    def exception(self) -> Exception:
-        return self._future.exception()
-
     def set_exception(self, exception) -> None:
         raise RuntimeError(f"{self} doesn't support set_exception()")
 
-    def done(self) -> bool:
-        return self._future.done()
-
-    def add_done_callback(self, callback) -> None:
-        self._future.add_done_callback(callback)
-
-    def remove_done_callback(self, callback) -> int:
-        return self._future.remove_done_callback(callback)
-
     def cancel(self) -> bool:
-        logger.debug('Cancelling %s', self)
+        if self._loop._debug:
+            logger.debug('Cancelling %s', self)
         if self.done():
-            logger.debug("Can't cancel %s, because it's already done", self)
+            if self._loop._debug:
+                logger.debug("Can't cancel %s, because it's already done", self)
             return False
         self._set_needs_to_force_cancel()
         return True
 
-    def cancelled(self) -> bool:
-        return self._future.cancelled()
-
-    def get_loop(self) -> _loop.Loop:
-        return self._loop
-
-    def __iter__(self):
-        yield self
-        return self.result()
-
-    def __await__(self):
-        return (yield from self)
-
     def _run(self):
         try:
             future = self._wake_up()
@@ -117,38 +108,53 @@ class Task(_base_future.BaseFuture):
         return not self._aio_future_blocking.cancel()
 
     def _mark_as_done(self, result):
-        logger.debug('%s is done with result %s', self, result)
+        if self._loop._debug:
+            logger.debug('%s is done with result %s', self, result)
         self._state = 'done'
-        self._future.set_result(result)
+        self._loop.remove_task(self)
+        self._set_result(result)
 
     def _mark_as_cancelled(self):
-        logger.debug('%s is cancelled', self)
+        if self._loop._debug:
+            logger.debug('%s is cancelled', self)
         self._state = 'cancelled'
-        self._future.cancel()
+        self._loop.remove_task(self)
+        super().cancel()
 
     def _mark_as_failed(self, exception):
-        logger.debug('%s is failed with exception %s', self, exception)
+        if self._loop._debug:
+            logger.debug('%s is failed with exception %s', self, exception)
         self._state = 'done'
-        self._future.set_exception(exception)
+        self._loop.remove_task(self)
+        self._set_exception(exception)
 
     def _block_on(self, future):
+        if future is None:
+            self._loop._add_ready_callback(self._run_handle)
+            return
         if not isinstance(future, _base_future.BaseFuture):
             raise RuntimeError(f'{future!r} is not a future')
         self._aio_future_blocking = future
         if self._needs_to_force_cancel:
             self._set_needs_to_force_cancel()
-        future.add_done_callback(lambda _: self._run())
+        future.add_done_callback(self._wake_up_after)
+
+    def _wake_up_after(self, future):
+        del future  # unused
+        self._run()
 
     def _set_needs_to_force_cancel(self):
         self._needs_to_force_cancel = self._determine_if_needs_to_force_cancel()
         if self._needs_to_force_cancel:
-            logger.debug('Will force cancel of %s on the next waking up', self)
+            if self._loop._debug:
+                logger.debug('Will force cancel of %s on the next waking up', self)
 
     def _hibernate(self):
         self.get_loop().set_current_task(None)
 
     def _mark_as_running(self):
-        logger.debug('Running %s', self)
+        if self._loop._debug:
+            logger.debug('Running %s', self)
         self._state = 'running'
         self._aio_future_blocking = None
         self.get_loop().set_current_task(self)
@@ -162,3 +168,13 @@ class Task(_base_future.BaseFuture):
 
 async def _wrap_awaitable(awaitable):
     return await awaitable
+
+
+@types.coroutine
+def _yield_to_loop():
+    yield
+
+
+def _set_result_unless_done(future, result) -> None:
+    if not future.done():
+        future.set_result(result)
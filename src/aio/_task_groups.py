@@ -0,0 +1,83 @@
+import typing as tp
+
+from . import _errors
+from . import _task
+
+
+class TaskGroup:
+    def __init__(self) -> None:
+        self._parent = None
+        self._loop = None
+        self._tasks = set()
+        self._errors: tp.List[Exception] = []
+        self._is_exiting = False
+        self._is_aborting = False
+        self._all_done = None
+
+    async def __aenter__(self) -> 'TaskGroup':
+        if self._parent is not None:
+            raise RuntimeError(f'{self} is already entered')
+        self._parent = _task.current_task()
+        if self._parent is None:
+            raise RuntimeError('TaskGroup should be used inside a task')
+        self._loop = self._parent.get_loop()
+        return self
+
+    def create_task(self, coro):
+        if self._parent is None:
+            coro.close()
+            raise RuntimeError(f'{self} is not entered')
+        if self._is_aborting or (self._is_exiting and not self._tasks):
+            coro.close()
+            raise RuntimeError(f'{self} is finished')
+        task = self._loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._is_exiting = True
+        if exc_type is not None:
+            # the parent is failed or cancelled, so nobody is interested in children anymore
+            self._abort()
+        is_cancelled = False
+        while self._tasks:
+            self._all_done = self._loop.create_future()
+            try:
+                await self._all_done
+            except _errors.CancelledError:
+                is_cancelled = True
+                self._abort()
+            finally:
+                self._all_done = None
+        if exc_type is not None and exc_type is not _errors.CancelledError:
+            return
+        if self._errors:
+            # there's no ExceptionGroup in python 3.7, so the first child failure wins
+            raise self._errors[0]
+        if is_cancelled:
+            raise _errors.CancelledError
+
+    def _on_task_done(self, task) -> None:
+        self._tasks.discard(task)
+        if not self._tasks and self._all_done is not None and not self._all_done.done():
+            self._all_done.set_result(None)
+        if task.cancelled() or task.exception() is None:
+            return
+        self._errors.append(task.exception())
+        if self._is_aborting:
+            return
+        self._abort()
+        if not self._is_exiting:
+            self._parent.cancel()
+
+    def _abort(self) -> None:
+        self._is_aborting = True
+        for task in self._tasks:
+            task.cancel()
+
+    def __str__(self) -> str:
+        return f'<TaskGroup tasks={len(self._tasks)} errors={len(self._errors)}>'
+
+    def __repr__(self) -> str:
+        return str(self)
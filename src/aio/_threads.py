@@ -0,0 +1,98 @@
+import logging
+import threading
+import typing as tp
+
+from . import _errors
+from . import _loop
+from . import _task
+
+logger = logging.getLogger(__name__)
+
+
+def run_in_threads(coro_function, num_threads: int, *args) -> tp.List:
+    if num_threads < 1:
+        raise ValueError(f'num_threads should be positive, got {num_threads}')
+    group = _ThreadGroup()
+    runners = [_ThreadRunner(group, coro_function, args) for _ in range(num_threads)]
+    group.runners.extend(runners)
+    for runner in runners:
+        runner.start()
+    try:
+        for runner in runners:
+            runner.join()
+    except BaseException:
+        logger.debug('Shutting down %d threads', num_threads)
+        group.shutdown()
+        for runner in runners:
+            runner.join()
+        raise
+    if group.exception is not None:
+        raise group.exception
+    return [runner.result for runner in runners]
+
+
+class _ThreadGroup:
+    def __init__(self) -> None:
+        self.runners: tp.List['_ThreadRunner'] = []
+        self.exception: tp.Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def fail(self, exception: BaseException) -> None:
+        with self._lock:
+            if self.exception is not None:
+                return
+            self.exception = exception
+        logger.debug('Shutting down threads after failure: %r', exception)
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        for runner in self.runners:
+            runner.cancel()
+
+
+class _ThreadRunner:
+    def __init__(self, group: _ThreadGroup, coro_function, args: tp.Tuple) -> None:
+        self.result = None
+        self._group = group
+        self._coro_function = coro_function
+        self._args = args
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._lock = threading.Lock()
+        self._loop: tp.Optional[_loop.Loop] = None
+        self._task: tp.Optional[_task.Task] = None
+        self._cancelled = False
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            if self._loop is None:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                logger.debug('%s is already closed', self._loop)
+
+    def _run(self) -> None:
+        loop = _loop.new_event_loop()
+        _loop.set_event_loop(loop)
+        try:
+            with self._lock:
+                if self._cancelled:
+                    return
+                task = _task.Task(self._coro_function(*self._args), loop=loop)
+                self._loop, self._task = loop, task
+            self.result = loop.run_until_complete(task)
+        except BaseException as exc:
+            if not (self._cancelled and isinstance(exc, _errors.CancelledError)):
+                self._group.fail(exc)
+        finally:
+            with self._lock:
+                self._loop = None
+            loop.close()
+            _loop.set_event_loop(None)
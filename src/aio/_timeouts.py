@@ -0,0 +1,49 @@
+import typing as tp
+
+from . import _errors
+from . import _task
+
+
+class Timeout:
+    def __init__(self, delay: tp.Optional[float]) -> None:
+        self._delay = delay
+        self._task = None
+        self._handle = None
+        self._is_expired = False
+
+    def expired(self) -> bool:
+        return self._is_expired
+
+    async def __aenter__(self) -> 'Timeout':
+        if self._task is not None:
+            raise RuntimeError(f'{self} is already entered')
+        self._task = _task.current_task()
+        if self._task is None:
+            raise RuntimeError('Timeout should be used inside a task')
+        if self._delay is not None:
+            # one timer for the whole scope, no matter how many futures it awaits
+            self._handle = self._task.get_loop().call_later(self._delay, self._on_timeout)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._is_expired and exc_type is _errors.CancelledError:
+            raise TimeoutError from exc
+
+    def _on_timeout(self) -> None:
+        self._handle = None
+        self._is_expired = True
+        self._task.cancel()
+
+    def __str__(self) -> str:
+        state = 'expired' if self._is_expired else 'active'
+        return f'<Timeout {state} delay={self._delay}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def timeout(delay: tp.Optional[float]) -> Timeout:
+    return Timeout(delay)
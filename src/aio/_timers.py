@@ -0,0 +1,234 @@
+import heapq
+import typing as tp
+
+HEAP = 'heap'
+WHEEL = 'wheel'
+
+_DEFAULT_RESOLUTION = 0.001
+_DEFAULT_NUM_SLOTS = 256
+_DEFAULT_NUM_LEVELS = 4
+
+_MIN_HEAP_SIZE_TO_COMPACT = 100
+_MAX_CANCELLED_FRACTION = 0.5
+
+# sort key of a timer: (when, index), index is unique, so timers are never compared
+_Key = tp.Tuple[float, int]
+_Slot = tp.Dict[tp.Any, _Key]
+
+
+class HeapTimers:
+    def __init__(self) -> None:
+        self._heap: tp.List[tp.Tuple[float, int, tp.Any]] = []
+        self._counter = 0
+        self._num_cancelled = 0
+
+    def add(self, handle) -> None:
+        heapq.heappush(self._heap, (handle.when(), self._counter, handle))
+        handle._scheduled = True
+        self._counter += 1
+
+    def remove(self, handle) -> None:
+        if not handle._scheduled:
+            return
+        self._num_cancelled += 1
+        if self._needs_compaction():
+            self._compact()
+
+    def next_when(self) -> tp.Optional[float]:
+        self._drop_cancelled_head()
+        if not self._heap:
+            return None
+        when, _, _ = self._heap[0]
+        return when
+
+    def pop_ready(self, now: float, ready: tp.Deque) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, handle = heapq.heappop(heap)
+            handle._scheduled = False
+            if handle.cancelled():
+                self._num_cancelled -= 1
+            else:
+                ready.append(handle)
+
+    def _drop_cancelled_head(self) -> None:
+        heap = self._heap
+        while heap and heap[0][2].cancelled():
+            _, _, handle = heapq.heappop(heap)
+            handle._scheduled = False
+            self._num_cancelled -= 1
+
+    def _needs_compaction(self) -> bool:
+        if len(self._heap) < _MIN_HEAP_SIZE_TO_COMPACT:
+            return False
+        return self._num_cancelled > _MAX_CANCELLED_FRACTION * len(self._heap)
+
+    def _compact(self) -> None:
+        heap = []
+        for entry in self._heap:
+            _, _, handle = entry
+            if handle.cancelled():
+                handle._scheduled = False
+            else:
+                heap.append(entry)
+        heapq.heapify(heap)
+        self._heap = heap
+        self._num_cancelled = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class TimingWheel:
+    def __init__(
+            self,
+            now: float,
+            resolution: float = _DEFAULT_RESOLUTION,
+            num_slots: int = _DEFAULT_NUM_SLOTS,
+            num_levels: int = _DEFAULT_NUM_LEVELS) -> None:
+        self._resolution = resolution
+        self._num_slots = num_slots
+        self._levels: tp.List[tp.List[_Slot]] = [
+            [{} for _ in range(num_slots)]
+            for _ in range(num_levels)
+        ]
+        self._overflow: _Slot = {}
+        self._expired: _Slot = {}
+        self._slots_by_handle: tp.Dict[tp.Any, _Slot] = {}
+        self._tick = self._get_tick(now)
+        self._counter = 0
+
+    def add(self, handle) -> None:
+        self._place(handle, (handle.when(), self._counter))
+        self._counter += 1
+
+    def remove(self, handle) -> None:
+        slot = self._slots_by_handle.pop(handle, None)
+        if slot is not None:
+            del slot[handle]
+
+    def next_when(self) -> tp.Optional[float]:
+        if not self._slots_by_handle:
+            return None
+        if self._expired:
+            return min(when for when, _ in self._expired.values())
+        candidates = []
+        first_level = self._levels[0]
+        for tick in range(self._tick, self._tick + self._num_slots):
+            slot = first_level[tick % self._num_slots]
+            if slot:
+                candidates.append(min(when for when, _ in slot.values()))
+                break
+        span = self._num_slots
+        for level in self._levels[1:]:
+            block = self._tick // span
+            for cur_block in range(block + 1, block + self._num_slots + 1):
+                if level[cur_block % self._num_slots]:
+                    candidates.append(cur_block * span * self._resolution)
+                    break
+            span *= self._num_slots
+        if self._overflow:
+            candidates.append((self._tick // span + 1) * span * self._resolution)
+        return min(candidates)
+
+    def pop_ready(self, now: float, ready: tp.Deque) -> None:
+        target = self._get_tick(now)
+        if not self._slots_by_handle:
+            self._tick = max(self._tick, target)
+            return
+        entries = list(self._expired.items())
+        self._expired.clear()
+        first_level = self._levels[0]
+        while self._tick < target:
+            slot = first_level[self._tick % self._num_slots]
+            entries.extend(slot.items())
+            slot.clear()
+            # empty ticks are skipped, so an idle period doesn't cost a step per tick
+            self._tick = self._find_next_busy_tick(target) - 1
+            self._advance()
+        slot = first_level[self._tick % self._num_slots]
+        for handle, key in list(slot.items()):
+            if key[0] <= now:
+                entries.append((handle, key))
+                del slot[handle]
+        entries.sort(key=_get_entry_key)
+        for handle, _ in entries:
+            del self._slots_by_handle[handle]
+            ready.append(handle)
+
+    def _find_next_busy_tick(self, limit: int) -> int:
+        first_level = self._levels[0]
+        for tick in range(self._tick + 1, min(limit, self._tick + self._num_slots)):
+            if first_level[tick % self._num_slots]:
+                limit = tick
+                break
+        span = 1
+        for level in self._levels[1:]:
+            span *= self._num_slots
+            first_block = self._tick // span + 1
+            for block in range(first_block, first_block + self._num_slots):
+                if block * span >= limit:
+                    break
+                if level[block % self._num_slots]:
+                    limit = block * span
+                    break
+        span *= self._num_slots
+        if self._overflow:
+            min_tick = self._get_tick(min(when for when, _ in self._overflow.values()))
+            # cascading overflow before its timers fit into the wheel would put them back
+            block = max(self._tick, min_tick - span) // span + 1
+            limit = min(limit, block * span)
+        return limit
+
+    def _advance(self) -> None:
+        self._tick += 1
+        cascading = []
+        span = 1
+        for level in self._levels[1:]:
+            span *= self._num_slots
+            if self._tick % span:
+                break
+            cascading.append(level[(self._tick // span) % self._num_slots])
+        else:
+            if not self._tick % (span * self._num_slots):
+                cascading.append(self._overflow)
+        for slot in reversed(cascading):
+            entries = list(slot.items())
+            slot.clear()
+            for handle, key in entries:
+                self._place(handle, key)
+
+    def _place(self, handle, key: _Key) -> None:
+        slot = self._find_slot(self._get_tick(key[0]))
+        slot[handle] = key
+        self._slots_by_handle[handle] = slot
+
+    def _find_slot(self, tick: int) -> _Slot:
+        if tick < self._tick:
+            return self._expired
+        delta = tick - self._tick
+        span = 1
+        for level in self._levels:
+            if delta < span * self._num_slots:
+                return level[(tick // span) % self._num_slots]
+            span *= self._num_slots
+        return self._overflow
+
+    def _get_tick(self, when: float) -> int:
+        return int(when / self._resolution)
+
+    def __len__(self) -> int:
+        return len(self._slots_by_handle)
+
+
+def new_timers(kind: str, now: float):
+    if kind == HEAP:
+        return HeapTimers()
+    if kind == WHEEL:
+        return TimingWheel(now)
+    raise ValueError(f'Unknown timers kind: {kind!r}, should be {HEAP!r} or {WHEEL!r}')
+
+
+def _get_entry_key(entry) -> _Key:
+    _, key = entry
+    return key
@@ -0,0 +1,332 @@
+import logging
+import socket
+import typing as tp
+
+logger = logging.getLogger(__name__)
+
+_MAX_READ_SIZE = 256 * 1024
+_DEFAULT_HIGH_WATER = 64 * 1024
+_ACCEPT_RETRY_DELAY = 1.0
+
+
+class BaseProtocol:
+    def connection_made(self, transport) -> None:
+        pass
+
+    def connection_lost(self, exc: tp.Optional[Exception]) -> None:
+        pass
+
+    def pause_writing(self) -> None:
+        pass
+
+    def resume_writing(self) -> None:
+        pass
+
+
+class Protocol(BaseProtocol):
+    def data_received(self, data: bytes) -> None:
+        pass
+
+    def eof_received(self) -> tp.Optional[bool]:
+        pass
+
+
+class Transport:
+    def __init__(self, loop, sock: socket.socket, protocol, waiter=None, server=None) -> None:
+        self._loop = loop
+        self._sock = sock
+        self._fd = sock.fileno()
+        self._protocol = protocol
+        self._server = server
+        self._extra = {
+            'socket': sock,
+            'sockname': _get_address(sock.getsockname),
+            'peername': _get_address(sock.getpeername),
+        }
+        self._buffer = bytearray()
+        self._high_water = _DEFAULT_HIGH_WATER
+        self._low_water = _DEFAULT_HIGH_WATER // 4
+        self._is_protocol_paused = False
+        self._is_reading = True
+        self._is_closing = False
+        self._is_eof = False
+        self._is_eof_written = False
+        self._is_connection_lost = False
+        if server is not None:
+            server._attach(self)
+        loop.call_soon(self._protocol.connection_made, self)
+        loop.call_soon(self._start_reading)
+        if waiter is not None:
+            loop.call_soon(_set_result_unless_cancelled, waiter, None)
+
+    def get_extra_info(self, name: str, default=None):
+        return self._extra.get(name, default)
+
+    def get_protocol(self):
+        return self._protocol
+
+    def set_protocol(self, protocol) -> None:
+        self._protocol = protocol
+
+    def write(self, data) -> None:
+        if self._is_eof_written:
+            raise RuntimeError(f"Can't write to {self} after write_eof()")
+        if self._is_closing or not data:
+            return
+        if not self._buffer:
+            try:
+                num_sent = self._sock.send(data)
+            except (BlockingIOError, InterruptedError):
+                num_sent = 0
+            except Exception as exc:
+                self._fatal_error(exc)
+                return
+            data = memoryview(data)[num_sent:]
+            if not data:
+                return
+            self._loop.add_writer(self._fd, self._write_ready)
+        self._buffer.extend(data)
+        self._maybe_pause_protocol()
+
+    def writelines(self, lines) -> None:
+        for data in lines:
+            self.write(data)
+
+    def write_eof(self) -> None:
+        if self._is_closing or self._is_eof_written:
+            return
+        self._is_eof_written = True
+        if not self._buffer:
+            self._sock.shutdown(socket.SHUT_WR)
+
+    def can_write_eof(self) -> bool:
+        return True
+
+    def get_write_buffer_size(self) -> int:
+        return len(self._buffer)
+
+    def get_write_buffer_limits(self) -> tp.Tuple[int, int]:
+        return self._low_water, self._high_water
+
+    def set_write_buffer_limits(self, high: tp.Optional[int] = None,
+                                low: tp.Optional[int] = None) -> None:
+        if high is None:
+            high = _DEFAULT_HIGH_WATER if low is None else 4 * low
+        if low is None:
+            low = high // 4
+        if not 0 <= low <= high:
+            raise ValueError(f'Expected 0 <= low <= high, got low={low} and high={high}')
+        self._high_water = high
+        self._low_water = low
+        self._maybe_pause_protocol()
+
+    def pause_reading(self) -> None:
+        if self._is_closing or self._is_eof or not self._is_reading:
+            return
+        self._is_reading = False
+        self._loop.remove_reader(self._fd)
+
+    def resume_reading(self) -> None:
+        if self._is_closing or self._is_eof or self._is_reading:
+            return
+        self._is_reading = True
+        self._loop.add_reader(self._fd, self._read_ready)
+
+    def is_reading(self) -> bool:
+        return self._is_reading and not self._is_closing
+
+    def is_closing(self) -> bool:
+        return self._is_closing
+
+    def close(self) -> None:
+        if self._is_closing:
+            return
+        self._is_closing = True
+        self._loop.remove_reader(self._fd)
+        if not self._buffer:
+            self._schedule_connection_lost(None)
+
+    def abort(self) -> None:
+        self._force_close(None)
+
+    def _start_reading(self) -> None:
+        if self._is_reading and not self._is_closing:
+            self._loop.add_reader(self._fd, self._read_ready)
+
+    def _read_ready(self) -> None:
+        try:
+            data = self._sock.recv(_MAX_READ_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as exc:
+            self._fatal_error(exc)
+            return
+        if data:
+            self._protocol.data_received(data)
+        else:
+            self._eof_received()
+
+    def _eof_received(self) -> None:
+        self._is_eof = True
+        keep_open = self._protocol.eof_received()
+        if keep_open:
+            self._is_reading = False
+            self._loop.remove_reader(self._fd)
+        else:
+            self.close()
+
+    def _write_ready(self) -> None:
+        try:
+            num_sent = self._sock.send(self._buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as exc:
+            self._fatal_error(exc)
+            return
+        del self._buffer[:num_sent]
+        self._maybe_resume_protocol()
+        if self._buffer:
+            return
+        self._loop.remove_writer(self._fd)
+        if self._is_closing:
+            self._schedule_connection_lost(None)
+        elif self._is_eof_written:
+            self._sock.shutdown(socket.SHUT_WR)
+
+    def _maybe_pause_protocol(self) -> None:
+        if self._is_protocol_paused or len(self._buffer) <= self._high_water:
+            return
+        self._is_protocol_paused = True
+        self._protocol.pause_writing()
+
+    def _maybe_resume_protocol(self) -> None:
+        if not self._is_protocol_paused or len(self._buffer) > self._low_water:
+            return
+        self._is_protocol_paused = False
+        self._protocol.resume_writing()
+
+    def _fatal_error(self, exc: Exception) -> None:
+        logger.debug('Fatal error on %s: %r', self, exc)
+        self._force_close(exc)
+
+    def _force_close(self, exc: tp.Optional[Exception]) -> None:
+        if self._buffer:
+            self._buffer.clear()
+            self._loop.remove_writer(self._fd)
+        self._is_closing = True
+        self._loop.remove_reader(self._fd)
+        self._schedule_connection_lost(exc)
+
+    def _schedule_connection_lost(self, exc: tp.Optional[Exception]) -> None:
+        if self._is_connection_lost:
+            return
+        self._is_connection_lost = True
+        self._loop.call_soon(self._call_connection_lost, exc)
+
+    def _call_connection_lost(self, exc: tp.Optional[Exception]) -> None:
+        try:
+            self._protocol.connection_lost(exc)
+        finally:
+            self._sock.close()
+            if self._server is not None:
+                self._server._detach(self)
+                self._server = None
+
+    def __str__(self) -> str:
+        state = 'closing' if self._is_closing else 'open'
+        return f'<Transport fd={self._fd} {state} buffer={len(self._buffer)}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class Server:
+    def __init__(self, loop, sockets: tp.List[socket.socket], protocol_factory,
+                 backlog: int) -> None:
+        self._loop = loop
+        self._sockets = sockets
+        self._protocol_factory = protocol_factory
+        self._backlog = backlog
+        self._transports = set()
+        self._is_serving = False
+        self._closed = loop.create_future()
+
+    @property
+    def sockets(self) -> tp.Tuple[socket.socket, ...]:
+        return tuple(self._sockets)
+
+    def get_loop(self):
+        return self._loop
+
+    def is_serving(self) -> bool:
+        return self._is_serving
+
+    def start_serving(self) -> None:
+        if self._is_serving:
+            return
+        self._is_serving = True
+        for sock in self._sockets:
+            self._loop.add_reader(sock.fileno(), self._accept_connections, sock)
+
+    def close(self) -> None:
+        if self._closed.done():
+            return
+        self._is_serving = False
+        for sock in self._sockets:
+            self._loop.remove_reader(sock.fileno())
+            sock.close()
+        self._sockets = []
+        self._closed.set_result(None)
+
+    async def wait_closed(self) -> None:
+        await self._closed
+
+    async def serve_forever(self) -> None:
+        self.start_serving()
+        try:
+            await self._closed
+        finally:
+            self.close()
+
+    def _attach(self, transport: Transport) -> None:
+        self._transports.add(transport)
+
+    def _detach(self, transport: Transport) -> None:
+        self._transports.discard(transport)
+
+    def _accept_connections(self, sock: socket.socket) -> None:
+        for _ in range(self._backlog):
+            try:
+                conn, _ = sock.accept()
+            except (BlockingIOError, InterruptedError, ConnectionAbortedError):
+                return
+            except OSError as exc:
+                # e.g. EMFILE, the listening socket stays readable, so polling it now would spin
+                logger.error('Failed to accept a connection on %s: %r', sock, exc)
+                self._loop.remove_reader(sock.fileno())
+                self._loop.call_later(_ACCEPT_RETRY_DELAY, self._resume_accepting, sock)
+                return
+            conn.setblocking(False)
+            Transport(self._loop, conn, self._protocol_factory(), server=self)
+
+    def _resume_accepting(self, sock: socket.socket) -> None:
+        if self._is_serving and sock in self._sockets:
+            self._loop.add_reader(sock.fileno(), self._accept_connections, sock)
+
+    def __str__(self) -> str:
+        return f'<Server sockets={self._sockets}>'
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def _get_address(function):
+    try:
+        return function()
+    except OSError:
+        return None
+
+
+def _set_result_unless_cancelled(future, result) -> None:
+    if not future.cancelled():
+        future.set_result(result)
@@ -1,78 +1,235 @@
 import asyncio
-import collections
+import dataclasses
+import typing as tp
 
 from . import common
+from . import metrics
+from . import pool
+
+_DEFAULT_HIGH_WATER = 256 * 1024
+_DEFAULT_LOW_WATER = 64 * 1024
+
+
+@dataclasses.dataclass(frozen=True)
+class WaterMarks:
+    high: int
+    low: int
 
 
 def main():
-    args = common.parse_args()
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(_start(args.listen_at, args.proxy_to, loop))
+    parser = common.build_arg_parser()
+    parser.add_argument('--high-water', type=int, default=_DEFAULT_HIGH_WATER)
+    parser.add_argument('--low-water', type=int, default=_DEFAULT_LOW_WATER)
+    pool.add_arguments(parser)
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    water_marks = WaterMarks(high=args.high_water, low=args.low_water)
+    common.run(_serve, args.loop, args, water_marks)
+
+
+async def _serve(loop, args, water_marks: WaterMarks):
+    upstream_pool = pool.from_args(args, loop)
+    registry = metrics.Registry()
+    metrics.report_periodically(registry, loop, args.stats_interval)
+    proxy_metrics = metrics.ProxyMetrics(registry)
+    try:
+        await _start(args.listen_at, args.proxy_to, water_marks, loop, upstream_pool,
+                     proxy_metrics, args.debug)
+    finally:
+        if upstream_pool is not None:
+            upstream_pool.close()
 
 
 class ClientProtocol(asyncio.Protocol):
-    def __init__(self, callbacks):
+    def __init__(self, callbacks, water_marks: WaterMarks,
+                 proxy_metrics: tp.Optional[metrics.ProxyMetrics] = None):
         self._server_protocol = callbacks
+        self._water_marks = water_marks
+        if proxy_metrics is None:
+            proxy_metrics = metrics.ProxyMetrics(metrics.Registry())
+        self._metrics = proxy_metrics
 
     def connection_made(self, transport):
         print(f'Client: connection_made, transport: {transport}')
+        _set_water_marks(transport, self._water_marks)
         self._server_protocol.connected_to_proxy(transport)
 
+    def data_received(self, data):
+        self._metrics.bytes_out.inc(len(data))
+        self._metrics.chunks_out.inc()
+        self._server_protocol.write(data)
+
+    def eof_received(self):
+        print('Client: eof_received')
+        self._server_protocol.proxy_eof_received()
+        # the other direction can still be relayed
+        return True
+
+    def pause_writing(self):
+        print('Client: pause_writing')
+        self._server_protocol.pause_reading()
+
+    def resume_writing(self):
+        print('Client: resume_writing')
+        self._server_protocol.resume_reading()
+
+    def connection_lost(self, exc):
+        print('Client: connection_lost')
+        self._server_protocol.proxy_connection_lost()
+
 
 class ProxyServerProtocol(asyncio.Protocol):
-    def __init__(self, proxy_to: common.Address, event):
+    def __init__(self, loop, proxy_to: common.Address, done, water_marks: WaterMarks,
+                 upstream_pool: tp.Optional[pool.ConnectionPool] = None,
+                 proxy_metrics: tp.Optional[metrics.ProxyMetrics] = None,
+                 debug: bool = False):
+        self._loop = loop
         self._proxy_to = proxy_to
-        self._event = event
+        self._done = done
+        self._water_marks = water_marks
+        self._pool = upstream_pool
+        if proxy_metrics is None:
+            proxy_metrics = metrics.ProxyMetrics(metrics.Registry())
+        self._metrics = proxy_metrics
+        self._debug = debug
         self._proxy_transport = None
-        self._buffer = collections.deque()
         self._transport = None
+        self._started_at = None
+        self._is_eof_received = False
+        self._is_proxy_eof_received = False
 
     def connection_made(self, transport):
         print('Server: connection_made')
         self._transport = transport
-        _connect(self._proxy_to, self)
+        self._started_at = self._loop.time()
+        self._metrics.connections.inc()
+        self._metrics.active_connections.inc()
+        _set_water_marks(transport, self._water_marks)
+        # data is kept in the kernel buffers till the proxy connection is ready
+        transport.pause_reading()
+        task = _connect(
+            self._loop, self._proxy_to, self, self._water_marks, self._pool, self._metrics)
+        task.add_done_callback(self._on_connect_done)
 
     def data_received(self, data):
-        print(f'Server: data_received {data!r}')
-        self._buffer.append(data)
+        if self._debug:
+            print(f'Server: data_received {len(data)} bytes')
+        self._metrics.bytes_in.inc(len(data))
+        self._metrics.chunks_in.inc()
+        self._proxy_transport.write(data)
+
+    def eof_received(self):
+        print('Server: eof_received')
+        self._is_eof_received = True
+        if self._proxy_transport is not None:
+            self._proxy_transport.write_eof()
+        self._close_if_both_eof_received()
+        # the other direction can still be relayed
+        return True
+
+    def pause_writing(self):
+        print('Server: pause_writing')
+        if self._proxy_transport is not None:
+            self._proxy_transport.pause_reading()
+
+    def resume_writing(self):
+        print('Server: resume_writing')
         if self._proxy_transport is not None:
-            self._flush()
+            self._proxy_transport.resume_reading()
 
     def connection_lost(self, exc):
         print('Server: connection_lost')
+        self._metrics.active_connections.dec()
+        self._metrics.connection_duration.observe(
+            self._loop.time() - self._started_at)
         if self._proxy_transport is not None:
             print('Server: closing proxy_transport')
             self._proxy_transport.close()
-        print('Server setting event')
-        self._event.set()
+        print('Server: done')
+        if not self._done.done():
+            self._done.set_result(None)
 
     def connected_to_proxy(self, transport):
         self._proxy_transport = transport
-        self._flush()
-
-    def _flush(self):
-        assert self._proxy_transport is not None
-        print(f'Server: flushing {len(self._buffer)} chunks')
-        while self._buffer:
-            chunk = self._buffer.popleft()
-            self._proxy_transport.write(chunk)
         if self._transport.is_closing():
             print('Server: closing proxy_transport')
             self._proxy_transport.close()
+            return
+        if self._is_eof_received:
+            self._proxy_transport.write_eof()
+        self._transport.resume_reading()
 
+    def _on_connect_done(self, task):
+        if task.cancelled() or task.exception() is not None:
+            print(f'Server: failed to connect to {self._proxy_to}')
+            self._transport.close()
 
-def _start(listen_at: common.Address, proxy_to: common.Address, loop):
+    def write(self, data):
+        self._transport.write(data)
+
+    def pause_reading(self):
+        self._transport.pause_reading()
+
+    def resume_reading(self):
+        self._transport.resume_reading()
+
+    def proxy_eof_received(self):
+        self._is_proxy_eof_received = True
+        self._transport.write_eof()
+        self._close_if_both_eof_received()
+
+    def proxy_connection_lost(self):
+        self._transport.close()
+
+    def _close_if_both_eof_received(self):
+        if self._is_eof_received and self._is_proxy_eof_received:
+            self._transport.close()
+
+
+def _start(listen_at: common.Address, proxy_to: common.Address, water_marks: WaterMarks, loop,
+           upstream_pool: tp.Optional[pool.ConnectionPool] = None,
+           proxy_metrics: tp.Optional[metrics.ProxyMetrics] = None, debug: bool = False):
     print(f'Loop is running: {loop.is_running()}')
-    event = asyncio.Event()
+    done = loop.create_future()
+    if upstream_pool is not None:
+        upstream_pool.warm(proxy_to)
     coro = loop.create_server(
-        lambda: ProxyServerProtocol(proxy_to, event), listen_at.host, listen_at.port)
+        lambda: ProxyServerProtocol(
+            loop, proxy_to, done, water_marks, upstream_pool, proxy_metrics, debug),
+        listen_at.host, listen_at.port)
     loop.create_task(coro)
     print(f'Listening at {listen_at}')
-    return event.wait()
+    return done
+
+
+def _connect(loop, proxy_to: common.Address, server_protocol, water_marks: WaterMarks,
+             upstream_pool: tp.Optional[pool.ConnectionPool] = None,
+             proxy_metrics: tp.Optional[metrics.ProxyMetrics] = None):
+    if upstream_pool is None:
+        coro = loop.create_connection(
+            lambda: ClientProtocol(server_protocol, water_marks, proxy_metrics),
+            proxy_to.host, proxy_to.port)
+    else:
+        coro = _connect_from_pool(
+            loop, proxy_to, server_protocol, water_marks, upstream_pool, proxy_metrics)
+    return loop.create_task(coro)
 
 
-def _connect(proxy_to: common.Address, server_protocol):
-    loop = asyncio.get_running_loop()
-    coro = loop.create_connection(lambda: ClientProtocol(server_protocol),
-                                  proxy_to.host, proxy_to.port)
-    return loop.create_task(coro)
+async def _connect_from_pool(loop, proxy_to: common.Address, server_protocol,
+                             water_marks: WaterMarks, upstream_pool: pool.ConnectionPool,
+                             proxy_metrics: tp.Optional[metrics.ProxyMetrics] = None):
+    sock = await upstream_pool.acquire(proxy_to)
+    try:
+        return await loop.create_connection(
+            lambda: ClientProtocol(server_protocol, water_marks, proxy_metrics), sock=sock)
+    except BaseException:
+        sock.close()
+        raise
+
+
+def _set_water_marks(transport, water_marks: WaterMarks):
+    transport.set_write_buffer_limits(high=water_marks.high, low=water_marks.low)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,53 @@
 import argparse
+import asyncio
 import dataclasses
+import typing as tp
+
+from . import _loop
+
+AIO = 'aio'
+ASYNCIO = 'asyncio'
+UVLOOP = 'uvloop'
+
+
+@dataclasses.dataclass(frozen=True)
+class LoopPolicy:
+    new_event_loop: tp.Callable
+    set_event_loop: tp.Callable
+
+
+_LOOP_POLICIES: tp.Dict[str, LoopPolicy] = {}
+
+
+def register_loop(name: str, new_event_loop: tp.Callable, set_event_loop: tp.Callable) -> None:
+    _LOOP_POLICIES[name] = LoopPolicy(new_event_loop, set_event_loop)
+
+
+def get_loop_names() -> tp.List[str]:
+    return sorted(_LOOP_POLICIES)
 
 
 def parse_args():
+    return build_arg_parser().parse_args()
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
     parser.add_argument('--listen-at', required=True, type=_parse_address)
     parser.add_argument('--proxy-to', required=True, type=_parse_address)
-    return parser.parse_args()
+    parser.add_argument('--loop', choices=get_loop_names(), default=ASYNCIO)
+    return parser
+
+
+def run(coro_function, loop_name: str, *args):
+    policy = _LOOP_POLICIES[loop_name]
+    loop = policy.new_event_loop()
+    policy.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro_function(loop, *args))
+    finally:
+        loop.close()
+        policy.set_event_loop(None)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -22,3 +63,17 @@ def _parse_address(addr: str) -> Address:
     return Address(
         host=host,
         port=int(port_str))
+
+
+def _register_default_loops() -> None:
+    register_loop(AIO, _loop.new_event_loop, _loop.set_event_loop)
+    register_loop(ASYNCIO, asyncio.new_event_loop, asyncio.set_event_loop)
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        register_loop(UVLOOP, uvloop.new_event_loop, asyncio.set_event_loop)
+
+
+_register_default_loops()
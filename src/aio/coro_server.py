@@ -1,48 +1,161 @@
-import asyncio
+import socket
+import typing as tp
 
 from . import common
+from . import metrics
+from . import pool
+from . import workers
+
+_DEFAULT_BUFFER_SIZE = 64 * 1024
+_BACKLOG = 1024
+_ACCEPT_RETRY_DELAY = 1.0
 
 
 def main():
-    args = common.parse_args()
-    asyncio.run(_start(args.listen_at, args.proxy_to))
+    args = parse_args()
+    if args.workers == 1:
+        _serve(args, False)
+    else:
+        workers.run_workers(args.workers, _serve, args, True)
+
+
+def parse_args(argv: tp.Optional[tp.List[str]] = None):
+    parser = common.build_arg_parser()
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--buffer-size', type=int, default=_DEFAULT_BUFFER_SIZE)
+    pool.add_arguments(parser)
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error(f'--workers should be >= 1, got {args.workers}')
+    return args
+
 
+def _serve(args, reuse_port: bool):
+    common.run(_start, args.loop, args, reuse_port)
 
-async def _start(listen_at: common.Address, proxy_to: common.Address):
-    server = await asyncio.start_server(
-        client_connected_cb=Handler(proxy_to),
-        host=listen_at.host,
-        port=listen_at.port)
-    async with server:
-        print(f'Listening at {listen_at}')
-        await server.serve_forever()
+
+async def _start(loop, args, reuse_port: bool):
+    upstream_pool = pool.from_args(args, loop)
+    if upstream_pool is not None:
+        upstream_pool.warm(args.proxy_to)
+    registry = metrics.Registry()
+    metrics.report_periodically(registry, loop, args.stats_interval)
+    handler = Handler(loop, args.proxy_to, args.buffer_size, upstream_pool,
+                      metrics.ProxyMetrics(registry), args.debug)
+    tasks = set()
+    try:
+        with _listen(args.listen_at, reuse_port) as listener:
+            print(f'Listening at {args.listen_at}')
+            while True:
+                client, _ = await _accept(loop, listener)
+                task = loop.create_task(handler(client))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+    finally:
+        if upstream_pool is not None:
+            upstream_pool.close()
 
 
 class Handler:
-    def __init__(self, proxy_to: common.Address):
+    def __init__(self, loop, proxy_to: common.Address, buffer_size: int = _DEFAULT_BUFFER_SIZE,
+                 upstream_pool: tp.Optional[pool.ConnectionPool] = None,
+                 proxy_metrics: tp.Optional[metrics.ProxyMetrics] = None,
+                 debug: bool = False):
+        self._loop = loop
         self._proxy_to = proxy_to
+        self._buffer_size = buffer_size
+        self._pool = upstream_pool
+        if proxy_metrics is None:
+            proxy_metrics = metrics.ProxyMetrics(metrics.Registry())
+        self._metrics = proxy_metrics
+        self._debug = debug
 
-    async def __call__(self, reader, writer):
+    async def __call__(self, client: socket.socket):
         print('Got connection')
-        chunk_size = 1000
-        proxy_writer = None
+        loop = self._loop
+        started_at = loop.time()
+        self._metrics.connections.inc()
+        self._metrics.active_connections.inc()
+        proxy = None
         try:
-            _, proxy_writer = await asyncio.open_connection(
-                self._proxy_to.host, self._proxy_to.port)
-            data = await reader.read(chunk_size)
-            while data:
-                print(f'Read chunk with length {len(data)}')
-                proxy_writer.write(data)
-                await proxy_writer.drain()
-                data = await reader.read(chunk_size)
+            proxy = await self._connect()
+            to_proxy = loop.create_task(
+                self._pump(client, proxy, self._metrics.bytes_in, self._metrics.chunks_in))
+            try:
+                await self._pump(
+                    proxy, client, self._metrics.bytes_out, self._metrics.chunks_out)
+                await to_proxy
+            finally:
+                to_proxy.cancel()
         finally:
             print(f'Closing connection to client')
-            await _close(writer)
-            if proxy_writer is not None:
+            client.close()
+            if proxy is not None:
                 print(f'Closing connection to {self._proxy_to}')
-                await _close(proxy_writer)
+                proxy.close()
+            self._metrics.active_connections.dec()
+            self._metrics.connection_duration.observe(loop.time() - started_at)
+
+    async def _connect(self) -> socket.socket:
+        if self._pool is None:
+            return await pool.connect(self._loop, self._proxy_to)
+        return await self._pool.acquire(self._proxy_to)
+
+    async def _pump(self, source: socket.socket, destination: socket.socket,
+                    bytes_counter: metrics.Counter, chunks_counter: metrics.Counter):
+        loop = self._loop
+        buffer = bytearray(self._buffer_size)
+        view = memoryview(buffer)
+        try:
+            num_bytes = await loop.sock_recv_into(source, buffer)
+            while num_bytes:
+                if self._debug:
+                    print(f'Read chunk with length {num_bytes}')
+                bytes_counter.inc(num_bytes)
+                chunks_counter.inc()
+                await loop.sock_sendall(destination, view[:num_bytes])
+                num_bytes = await loop.sock_recv_into(source, buffer)
+        except OSError as exc:
+            print(f'Stopped relaying because of {exc!r}')
+        _shutdown_write(destination)
+
+
+async def _accept(loop, listener: socket.socket):
+    while True:
+        try:
+            return await loop.sock_accept(listener)
+        except OSError as exc:
+            # e.g. EMFILE, accepting again right away would fail the same way
+            print(f'Failed to accept a connection: {exc!r}')
+            retry = loop.create_future()
+            loop.call_later(_ACCEPT_RETRY_DELAY, retry.set_result, None)
+            await retry
+
+
+def _listen(address: common.Address, reuse_port: bool) -> socket.socket:
+    family, type_, proto, _, sockaddr = socket.getaddrinfo(
+        address.host, address.port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)[0]
+    listener = socket.socket(family, type_, proto)
+    try:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        listener.bind(sockaddr)
+        listener.listen(_BACKLOG)
+        listener.setblocking(False)
+    except OSError:
+        listener.close()
+        raise
+    return listener
+
+
+def _shutdown_write(sock: socket.socket):
+    try:
+        sock.shutdown(socket.SHUT_WR)
+    except OSError:
+        pass
 
 
-async def _close(writer):
-    writer.close()
-    await writer.wait_closed()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import os
+import typing as tp
+
+
+class Counter:
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> tp.Dict[str, float]:
+        return {'': self.value}
+
+
+class Gauge(Counter):
+    __slots__ = ()
+
+    def dec(self, amount: int = 1) -> None:
+        self.value -= amount
+
+
+class Summary:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self) -> tp.Dict[str, float]:
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            '_count': self.count,
+            '_mean': mean,
+            '_max': self.max,
+        }
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: tp.Dict[str, tp.Union[Counter, Summary]] = {}
+
+    def counter(self, name: str) -> Counter:
+        return self._get_or_create(name, Counter)
+
+    def gauge(self, name: str) -> Gauge:
+        return self._get_or_create(name, Gauge)
+
+    def summary(self, name: str) -> Summary:
+        return self._get_or_create(name, Summary)
+
+    def snapshot(self) -> tp.Dict[str, float]:
+        result = {}
+        for name, metric in self._metrics.items():
+            for suffix, value in metric.snapshot().items():
+                result[name + suffix] = value
+        return result
+
+    def format(self) -> str:
+        values = ' '.join(
+            f'{name}={_format_value(value)}'
+            for name, value in self.snapshot().items()
+        )
+        return f'Stats[{os.getpid()}]: {values}'
+
+    def _get_or_create(self, name: str, cls):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls()
+        elif type(metric) is not cls:
+            raise ValueError(f'Metric {name!r} is already registered as {type(metric).__name__}')
+        return metric
+
+
+class ProxyMetrics:
+    def __init__(self, registry: Registry) -> None:
+        self.bytes_in = registry.counter('bytes_in')
+        self.bytes_out = registry.counter('bytes_out')
+        self.chunks_in = registry.counter('chunks_in')
+        self.chunks_out = registry.counter('chunks_out')
+        self.connections = registry.counter('connections')
+        self.active_connections = registry.gauge('active_connections')
+        self.connection_duration = registry.summary('connection_duration')
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--stats-interval', type=float, default=0.0,
+                        help='seconds between stats dumps, 0 disables them')
+    parser.add_argument('--debug', action='store_true',
+                        help='log every relayed chunk')
+
+
+def report_periodically(registry: Registry, loop, interval: float) -> None:
+    def report():
+        print(registry.format())
+        if hasattr(loop, 'get_callbacks_histogram'):
+            print(_format_loop_stats(loop))
+        loop.call_later(interval, report)
+
+    if interval > 0:
+        loop.call_later(interval, report)
+
+
+def _format_loop_stats(loop) -> str:
+    histogram = ' '.join(
+        f'<={max_callbacks}:{count}'
+        for max_callbacks, count in loop.get_callbacks_histogram().items()
+    )
+    return (f'Loop[{os.getpid()}]: iterations={loop.get_num_iterations()} '
+            f'callbacks_per_iteration={histogram}')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        return f'{value:.6f}'
+    return str(value)
@@ -0,0 +1,175 @@
+import argparse
+import collections
+import dataclasses
+import socket
+import typing as tp
+
+from . import common
+
+_DEFAULT_MAX_IDLE_TIME = 60.0
+_DEFAULT_CHECK_INTERVAL = 5.0
+
+
+@dataclasses.dataclass(frozen=True)
+class _IdleConnection:
+    sock: socket.socket
+    since: float
+
+
+class ConnectionPool:
+    def __init__(
+            self,
+            loop,
+            *,
+            min_size: int = 0,
+            max_size: int = 10,
+            max_idle_time: float = _DEFAULT_MAX_IDLE_TIME,
+            check_interval: float = _DEFAULT_CHECK_INTERVAL) -> None:
+        if not 0 <= min_size <= max_size:
+            raise ValueError(f'Expected 0 <= min_size <= max_size, got {min_size} and {max_size}')
+        self._loop = loop
+        self._min_size = min_size
+        self._max_size = max_size
+        self._max_idle_time = max_idle_time
+        self._check_interval = check_interval
+        self._idle: tp.Dict[common.Address, tp.Deque[_IdleConnection]] = {}
+        self._num_connecting: tp.Counter[common.Address] = collections.Counter()
+        self._tasks = set()
+        self._check_handle = None
+        self._is_closed = False
+
+    def warm(self, address: common.Address) -> None:
+        self._require_not_is_closed()
+        self._get_idle(address)
+        self._fill(address, self._min_size)
+        self._schedule_check()
+
+    async def acquire(self, address: common.Address) -> socket.socket:
+        self._require_not_is_closed()
+        idle = self._get_idle(address)
+        while idle:
+            connection = idle.popleft()
+            if _is_healthy(connection.sock):
+                self._fill(address, self._get_size(address) + 1)
+                return connection.sock
+            connection.sock.close()
+        self._fill(address, self._get_size(address) + 1)
+        self._schedule_check()
+        return await connect(self._loop, address)
+
+    def size(self, address: common.Address) -> int:
+        return len(self._idle.get(address, ()))
+
+    def close(self) -> None:
+        self._is_closed = True
+        if self._check_handle is not None:
+            self._check_handle.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        for idle in self._idle.values():
+            while idle:
+                idle.popleft().sock.close()
+
+    def _get_idle(self, address: common.Address) -> tp.Deque[_IdleConnection]:
+        if address not in self._idle:
+            self._idle[address] = collections.deque()
+        return self._idle[address]
+
+    def _get_size(self, address: common.Address) -> int:
+        return len(self._idle[address]) + self._num_connecting[address]
+
+    def _fill(self, address: common.Address, size: int) -> None:
+        for _ in range(min(size, self._max_size) - self._get_size(address)):
+            self._num_connecting[address] += 1
+            task = self._loop.create_task(self._add_connection(address))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _add_connection(self, address: common.Address) -> None:
+        try:
+            sock = await connect(self._loop, address)
+        except OSError as exc:
+            print(f'Pool: failed to connect to {address}: {exc!r}')
+            return
+        finally:
+            self._num_connecting[address] -= 1
+        if self._is_closed:
+            sock.close()
+        else:
+            self._idle[address].append(_IdleConnection(sock, self._loop.time()))
+
+    def _schedule_check(self) -> None:
+        if self._check_handle is None and not self._is_closed:
+            self._check_handle = self._loop.call_later(self._check_interval, self._check)
+
+    def _check(self) -> None:
+        self._check_handle = None
+        now = self._loop.time()
+        for address, idle in self._idle.items():
+            self._evict(idle, now)
+            self._fill(address, self._min_size)
+        self._schedule_check()
+
+    def _evict(self, idle: tp.Deque[_IdleConnection], now: float) -> None:
+        connections = list(idle)
+        idle.clear()
+        num_expired_to_keep = self._min_size
+        for connection in reversed(connections):
+            if not _is_healthy(connection.sock):
+                connection.sock.close()
+            elif now - connection.since < self._max_idle_time:
+                idle.appendleft(connection)
+            elif num_expired_to_keep > 0:
+                num_expired_to_keep -= 1
+                idle.appendleft(connection)
+            else:
+                connection.sock.close()
+
+    def _require_not_is_closed(self) -> None:
+        if self._is_closed:
+            raise RuntimeError('Connection pool is closed')
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--pool-min-size', type=int, default=0)
+    parser.add_argument('--pool-max-size', type=int, default=0,
+                        help='0 disables the upstream connection pool')
+    parser.add_argument('--pool-max-idle-time', type=float, default=_DEFAULT_MAX_IDLE_TIME)
+    parser.add_argument('--pool-check-interval', type=float, default=_DEFAULT_CHECK_INTERVAL)
+
+
+def from_args(args: argparse.Namespace, loop) -> tp.Optional[ConnectionPool]:
+    if args.pool_max_size == 0:
+        return None
+    return ConnectionPool(
+        loop,
+        min_size=args.pool_min_size,
+        max_size=args.pool_max_size,
+        max_idle_time=args.pool_max_idle_time,
+        check_interval=args.pool_check_interval)
+
+
+async def connect(loop, address: common.Address) -> socket.socket:
+    infos = await loop.getaddrinfo(address.host, address.port, type=socket.SOCK_STREAM)
+    if not infos:
+        raise OSError(f'getaddrinfo() returned no addresses for {address}')
+    family, type_, proto, _, sockaddr = infos[0]
+    sock = socket.socket(family, type_, proto)
+    try:
+        sock.setblocking(False)
+        await loop.sock_connect(sock, sockaddr)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def _is_healthy(sock: socket.socket) -> bool:
+    try:
+        data = sock.recv(1, socket.MSG_PEEK)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    # pending data like a banner is left for the client, only EOF means the upstream is gone
+    return bool(data)
@@ -0,0 +1,71 @@
+import os
+import signal
+import sys
+import time
+import traceback
+import typing as tp
+
+_MIN_WORKER_LIFETIME = 1.0
+
+
+def run_workers(num_workers: int, target: tp.Callable, *args) -> None:
+    supervisor = _Supervisor(num_workers, target, args)
+    supervisor.run()
+
+
+class _Supervisor:
+    def __init__(self, num_workers: int, target: tp.Callable, args: tp.Tuple) -> None:
+        self._num_workers = num_workers
+        self._target = target
+        self._args = args
+        self._started_at_by_pid: tp.Dict[int, float] = {}
+        self._is_stopping = False
+
+    def run(self) -> None:
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+        for _ in range(self._num_workers):
+            self._spawn()
+        while self._started_at_by_pid:
+            pid, status = os.wait()
+            started_at = self._started_at_by_pid.pop(pid, None)
+            if started_at is None or self._is_stopping:
+                continue
+            print(f'Worker {pid} exited with status {status}, restarting it')
+            if time.monotonic() - started_at < _MIN_WORKER_LIFETIME:
+                time.sleep(_MIN_WORKER_LIFETIME)
+                # the supervisor could've been stopped while sleeping
+                if self._is_stopping:
+                    continue
+            self._spawn()
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self._started_at_by_pid[pid] = time.monotonic()
+        print(f'Started worker {pid}')
+
+    def _run_worker(self) -> tp.NoReturn:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            self._target(*self._args)
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            # os._exit() doesn't flush stdio buffers
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    def _stop(self, signum, frame) -> None:
+        del frame  # unused
+        self._is_stopping = True
+        for pid in self._started_at_by_pid:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
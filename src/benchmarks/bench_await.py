@@ -0,0 +1,39 @@
+import argparse
+import logging
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-awaits', type=int, default=200_000)
+    args = parser.parse_args()
+    for debug in [False, True]:
+        duration = _measure(args.num_awaits, debug)
+        print(f'debug={debug}: {duration / args.num_awaits * 1e6:.2f} us/await')
+
+
+def _measure(num_awaits: int, debug: bool) -> float:
+    logger = logging.getLogger('aio')
+    logger.setLevel(logging.DEBUG if debug else logging.WARNING)
+    loop = aio.new_event_loop()
+    loop.set_debug(debug)
+    aio.set_event_loop(loop)
+    started_at = time.perf_counter()
+    loop.run_until_complete(_await_many(loop, num_awaits))
+    duration = time.perf_counter() - started_at
+    loop.close()
+    aio.set_event_loop(None)
+    return duration
+
+
+async def _await_many(loop: aio.Loop, num_awaits: int):
+    for _ in range(num_awaits):
+        future = aio.Future(loop=loop)
+        loop.call_soon(future.set_result, None)
+        await future
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-callbacks', type=int, default=1_000_000)
+    args = parser.parse_args()
+    for name, measure in [('chained', _measure_chained), ('batched', _measure_batched)]:
+        duration = measure(args.num_callbacks)
+        print(f'call_soon {name}: {args.num_callbacks / duration:,.0f} callbacks/sec')
+
+
+def _measure_chained(num_callbacks: int) -> float:
+    loop = aio.new_event_loop()
+    started_at = time.perf_counter()
+    loop.call_soon(_Counter(loop, num_callbacks))
+    loop.run_forever()
+    duration = time.perf_counter() - started_at
+    loop.close()
+    return duration
+
+
+def _measure_batched(num_callbacks: int) -> float:
+    loop = aio.new_event_loop()
+    counter = _Counter(loop, num_callbacks, reschedule=False)
+    started_at = time.perf_counter()
+    for _ in range(num_callbacks):
+        loop.call_soon(counter)
+    loop.run_forever()
+    duration = time.perf_counter() - started_at
+    loop.close()
+    return duration
+
+
+class _Counter:
+    def __init__(self, loop: aio.Loop, num_callbacks: int, reschedule: bool = True):
+        self._loop = loop
+        self._num_left = num_callbacks
+        self._reschedule = reschedule
+
+    def __call__(self):
+        self._num_left -= 1
+        if not self._num_left:
+            self._loop.stop()
+        elif self._reschedule:
+            self._loop.call_soon(self)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-futures', type=int, default=500_000)
+    args = parser.parse_args()
+    loop = aio.new_event_loop()
+    aio.set_event_loop(loop)
+    for name, measure in [('set_result', _measure_set_result),
+                          ('set_exception', _measure_set_exception),
+                          ('set_result + await', _measure_round_trip)]:
+        duration = measure(loop, args.num_futures)
+        print(f'{name}: {args.num_futures / duration:,.0f} futures/sec')
+    loop.close()
+    aio.set_event_loop(None)
+
+
+def _measure_set_result(loop: aio.Loop, num_futures: int) -> float:
+    futures = [aio.Future(loop=loop) for _ in range(num_futures)]
+    started_at = time.perf_counter()
+    for future in futures:
+        future.set_result(None)
+    return time.perf_counter() - started_at
+
+
+def _measure_set_exception(loop: aio.Loop, num_futures: int) -> float:
+    futures = [aio.Future(loop=loop) for _ in range(num_futures)]
+    exception = ZeroDivisionError()
+    started_at = time.perf_counter()
+    for future in futures:
+        future.set_exception(exception)
+    return time.perf_counter() - started_at
+
+
+def _measure_round_trip(loop: aio.Loop, num_futures: int) -> float:
+    started_at = time.perf_counter()
+    loop.run_until_complete(_set_and_await(loop, num_futures))
+    return time.perf_counter() - started_at
+
+
+async def _set_and_await(loop: aio.Loop, num_futures: int):
+    for _ in range(num_futures):
+        future = aio.Future(loop=loop)
+        loop.call_soon(future.set_result, None)
+        await future
+
+
+if __name__ == '__main__':
+    main()
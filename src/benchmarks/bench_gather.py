@@ -0,0 +1,56 @@
+import argparse
+import functools
+import time
+import tracemalloc
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-children', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+    loop = aio.new_event_loop()
+    aio.set_event_loop(loop)
+    for num_children in args.num_children:
+        for name, gather in [('aio.gather', aio.gather), ('per-child callbacks', _gather_by_hand)]:
+            duration, peak = _measure(loop, gather, num_children)
+            print(f'{name}, {num_children:,} children: '
+                  f'{duration / num_children * 1e6:.2f} us/child, '
+                  f'{peak / num_children:.0f} bytes/child')
+    loop.close()
+    aio.set_event_loop(None)
+
+
+def _measure(loop: aio.Loop, gather, num_children: int):
+    children = [aio.Future(loop=loop) for _ in range(num_children)]
+    tracemalloc.start()
+    started_at = time.perf_counter()
+    gathering = gather(*children)
+    for index, child in enumerate(children):
+        child.set_result(index)
+    loop.run_until_complete(gathering)
+    duration = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
+
+
+def _gather_by_hand(*children):
+    outer = aio.Future()
+    results = [None] * len(children)
+    num_left = [len(children)]
+    for index, child in enumerate(children):
+        child.add_done_callback(functools.partial(_on_child_done, outer, results, num_left, index))
+    return outer
+
+
+def _on_child_done(outer, results, num_left, index, child):
+    results[index] = child.result()
+    num_left[0] -= 1
+    if not num_left[0]:
+        outer.set_result(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-acquires', type=int, default=200_000)
+    parser.add_argument('--num-workers', type=int, nargs='+', default=[1, 100, 10_000])
+    args = parser.parse_args()
+    for name, library in [('aio', aio), ('asyncio', asyncio)]:
+        for num_workers in args.num_workers:
+            duration = _measure(library, args.num_acquires, num_workers)
+            print(f'{name}.Lock, {num_workers:,} workers: '
+                  f'{duration / args.num_acquires * 1e9:.0f} ns/acquire')
+
+
+def _measure(library, num_acquires: int, num_workers: int) -> float:
+    loop = library.new_event_loop()
+    library.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(_contend(library, num_acquires, num_workers))
+    finally:
+        loop.close()
+        library.set_event_loop(None)
+
+
+async def _contend(library, num_acquires: int, num_workers: int) -> float:
+    lock = library.Lock()
+    num_acquires_per_worker = num_acquires // num_workers
+
+    async def worker():
+        for _ in range(num_acquires_per_worker):
+            async with lock:
+                if num_workers > 1:
+                    await library.sleep(0)
+
+    started_at = time.perf_counter()
+    await library.gather(*[worker() for _ in range(num_workers)])
+    return time.perf_counter() - started_at
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import gc
+import tracemalloc
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-tasks', type=int, default=100_000)
+    args = parser.parse_args()
+    num_bytes = _measure(args.num_tasks)
+    print(f'idle task: {num_bytes / args.num_tasks:,.0f} bytes/task')
+
+
+def _measure(num_tasks: int) -> int:
+    loop = aio.new_event_loop()
+    aio.set_event_loop(loop)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tasks = [aio.Task(_wait_forever(loop), loop=loop) for _ in range(num_tasks)]
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert not any(task.done() for task in tasks)
+    return after - before
+
+
+async def _wait_forever(loop: aio.Loop):
+    await aio.Future(loop=loop)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import typing as tp
+
+from aio import common
+from aio import coro_server
+
+_CHUNK_SIZE = 64 * 1024
+_PING = b'x'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--loops', nargs='+', choices=common.get_loop_names(),
+                        default=common.get_loop_names())
+    parser.add_argument('--megabytes', type=int, default=512)
+    parser.add_argument('--buffer-size', type=int, default=64 * 1024)
+    parser.add_argument('--connections', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--message-size', type=int, default=4096)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--pool-size', type=int, default=0)
+    args = parser.parse_args()
+    echo_at = common.Address('127.0.0.1', _get_free_port())
+    echo = multiprocessing.Process(target=_serve_echo, args=(echo_at,), daemon=True)
+    echo.start()
+    try:
+        _wait_for(echo_at)
+        for loop_name in args.loops:
+            _bench_loop(loop_name, echo_at, args)
+    finally:
+        echo.terminate()
+
+
+def _bench_loop(loop_name: str, echo_at: common.Address, args):
+    listen_at = common.Address('127.0.0.1', _get_free_port())
+    server_args = coro_server.parse_args([
+        f'--listen-at={listen_at.host}:{listen_at.port}',
+        f'--proxy-to={echo_at.host}:{echo_at.port}',
+        f'--buffer-size={args.buffer_size}',
+        f'--pool-min-size={args.pool_size}',
+        f'--pool-max-size={args.pool_size}',
+        f'--loop={loop_name}',
+    ])
+    server = multiprocessing.Process(
+        target=_serve_quietly, args=(server_args,), daemon=True)
+    server.start()
+    try:
+        _wait_for(listen_at)
+        duration = _measure(listen_at, args.megabytes * 1024 * 1024)
+        print(f'{loop_name}: stream {args.megabytes / duration:,.1f} MB/s')
+        duration = _measure_connections(listen_at, args.connections)
+        print(f'{loop_name}: {args.connections / duration:,.0f} connections/s')
+        latencies = asyncio.run(_drive_clients(
+            listen_at, args.clients, args.message_size, args.duration))
+        megabytes = len(latencies) * args.message_size / (1024 * 1024)
+        print(f'{loop_name}: {args.clients} clients, '
+              f'{megabytes / args.duration:,.1f} MB/s, '
+              f'p50 {_percentile(latencies, 0.5) * 1e6:,.0f} us, '
+              f'p99 {_percentile(latencies, 0.99) * 1e6:,.0f} us')
+    finally:
+        server.terminate()
+
+
+def _serve_quietly(server_args):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        coro_server._serve(server_args, False)
+
+
+def _measure(address: common.Address, num_bytes: int) -> float:
+    chunk = b'x' * _CHUNK_SIZE
+    with socket.create_connection((address.host, address.port)) as sock:
+        started_at = time.perf_counter()
+        reader = threading.Thread(target=_read_exactly, args=(sock, num_bytes))
+        reader.start()
+        num_sent = 0
+        while num_sent < num_bytes:
+            sock.sendall(chunk)
+            num_sent += len(chunk)
+        reader.join()
+        return time.perf_counter() - started_at
+
+
+def _measure_connections(address: common.Address, num_connections: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(num_connections):
+        with socket.create_connection((address.host, address.port)) as sock:
+            sock.sendall(_PING)
+            _read_exactly(sock, len(_PING))
+    return time.perf_counter() - started_at
+
+
+async def _drive_clients(address: common.Address, num_clients: int, message_size: int,
+                         duration: float) -> tp.List[float]:
+    latencies = []
+    message = b'x' * message_size
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*[
+        _drive_client(address, message, deadline, latencies)
+        for _ in range(num_clients)
+    ])
+    return latencies
+
+
+async def _drive_client(address: common.Address, message: bytes, deadline: float,
+                        latencies: tp.List[float]):
+    reader, writer = await asyncio.open_connection(address.host, address.port)
+    try:
+        while time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            writer.write(message)
+            await reader.readexactly(len(message))
+            latencies.append(time.perf_counter() - started_at)
+    finally:
+        writer.close()
+
+
+def _percentile(values: tp.List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[int(fraction * (len(values) - 1))]
+
+
+def _read_exactly(sock: socket.socket, num_bytes: int):
+    buffer = bytearray(_CHUNK_SIZE)
+    while num_bytes > 0:
+        num_read = sock.recv_into(buffer)
+        if not num_read:
+            raise RuntimeError('Connection closed before all echoed data was read')
+        num_bytes -= num_read
+
+
+def _serve_echo(address: common.Address):
+    asyncio.run(_start_echo(address))
+
+
+async def _start_echo(address: common.Address):
+    server = await asyncio.start_server(_echo, address.host, address.port)
+    async with server:
+        await server.serve_forever()
+
+
+async def _echo(reader, writer):
+    data = await reader.read(_CHUNK_SIZE)
+    while data:
+        writer.write(data)
+        await writer.drain()
+        data = await reader.read(_CHUNK_SIZE)
+    writer.close()
+
+
+def _get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(address: common.Address):
+    for _ in range(100):
+        try:
+            socket.create_connection((address.host, address.port)).close()
+            return
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    raise RuntimeError(f'{address} is not listening')
+
+
+if __name__ == '__main__':
+    main()
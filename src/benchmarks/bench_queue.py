@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-items', type=int, default=500_000)
+    parser.add_argument('--maxsize', type=int, default=1024)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+    variants = [
+        ('asyncio.Queue put/get', asyncio, _produce_one_by_one, _consume_one_by_one),
+        ('aio.Queue put/get', aio, _produce_one_by_one, _consume_one_by_one),
+        ('aio.Queue put_many/get_many', aio, _produce_batches, _consume_batches),
+    ]
+    for name, library, produce, consume in variants:
+        duration = _measure(library, produce, consume, args)
+        print(f'{name}: {args.num_items / duration:,.0f} items/s')
+
+
+def _measure(library, produce, consume, args: argparse.Namespace) -> float:
+    loop = library.new_event_loop()
+    library.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(_pipe(library, produce, consume, args))
+    finally:
+        loop.close()
+        library.set_event_loop(None)
+
+
+async def _pipe(library, produce, consume, args: argparse.Namespace) -> float:
+    queue = library.Queue(maxsize=args.maxsize)
+    started_at = time.perf_counter()
+    await library.gather(
+        produce(queue, args.num_items, args.batch_size),
+        consume(queue, args.num_items, args.batch_size))
+    return time.perf_counter() - started_at
+
+
+async def _produce_one_by_one(queue, num_items: int, batch_size: int) -> None:
+    del batch_size  # unused
+    for item in range(num_items):
+        await queue.put(item)
+
+
+async def _consume_one_by_one(queue, num_items: int, batch_size: int) -> None:
+    del batch_size  # unused
+    for _ in range(num_items):
+        await queue.get()
+
+
+async def _produce_batches(queue, num_items: int, batch_size: int) -> None:
+    for start in range(0, num_items, batch_size):
+        await queue.put_many(range(start, min(start + batch_size, num_items)))
+
+
+async def _consume_batches(queue, num_items: int, batch_size: int) -> None:
+    num_left = num_items
+    while num_left:
+        num_left -= len(await queue.get_many(batch_size))
+
+
+if __name__ == '__main__':
+    main()
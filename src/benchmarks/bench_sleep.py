@@ -0,0 +1,37 @@
+import argparse
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-yields', type=int, default=1_000_000)
+    args = parser.parse_args()
+    for name, coro_function in [('sleep(0)', _yield_with_sleep),
+                                ('future + call_soon', _yield_with_future)]:
+        loop = aio.new_event_loop()
+        aio.set_event_loop(loop)
+        started_at = time.perf_counter()
+        loop.run_until_complete(coro_function(loop, args.num_yields))
+        duration = time.perf_counter() - started_at
+        loop.close()
+        aio.set_event_loop(None)
+        print(f'{name}: {duration / args.num_yields * 1e9:,.0f} ns/yield')
+
+
+async def _yield_with_sleep(loop: aio.Loop, num_yields: int):
+    del loop  # unused
+    for _ in range(num_yields):
+        await aio.sleep(0)
+
+
+async def _yield_with_future(loop: aio.Loop, num_yields: int):
+    for _ in range(num_yields):
+        future = loop.create_future()
+        loop.call_soon(future.set_result, None)
+        await future
+
+
+if __name__ == '__main__':
+    main()
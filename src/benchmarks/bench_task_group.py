@@ -0,0 +1,55 @@
+import argparse
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-children', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    for num_children in args.num_children:
+        for name, run in [('wait_for per child', _run_with_wait_for),
+                          ('TaskGroup in timeout', _run_in_task_group)]:
+            duration, max_timers = _measure(run, num_children)
+            print(f'{name}, {num_children:,} children: '
+                  f'{duration / num_children * 1e6:.2f} us/child, {max_timers:,} timers')
+
+
+def _measure(run, num_children: int):
+    loop = aio.new_event_loop()
+    aio.set_event_loop(loop)
+    try:
+        started_at = time.perf_counter()
+        max_timers = loop.run_until_complete(run(loop, num_children))
+        return time.perf_counter() - started_at, max_timers
+    finally:
+        loop.close()
+        aio.set_event_loop(None)
+
+
+async def _run_with_wait_for(loop, num_children: int) -> int:
+    tasks = [loop.create_task(aio.wait_for(_child(), 10)) for _ in range(num_children)]
+    await aio.sleep(0)
+    await aio.sleep(0)
+    max_timers = len(loop._scheduled)
+    await aio.gather(*tasks)
+    return max_timers
+
+
+async def _run_in_task_group(loop, num_children: int) -> int:
+    async with aio.timeout(10):
+        async with aio.TaskGroup() as group:
+            for _ in range(num_children):
+                group.create_task(_child())
+            await aio.sleep(0)
+            max_timers = len(loop._scheduled)
+    return max_timers
+
+
+async def _child() -> None:
+    await aio.sleep(0)
+
+
+if __name__ == '__main__':
+    main()
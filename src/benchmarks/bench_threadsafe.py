@@ -0,0 +1,48 @@
+import argparse
+import statistics
+import threading
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-calls', type=int, default=1000)
+    args = parser.parse_args()
+    latencies = _measure(args.num_calls)
+    print(f'call_soon_threadsafe latency: '
+          f'p50 {statistics.median(latencies) * 1e6:.0f} us, '
+          f'max {max(latencies) * 1e6:.0f} us')
+
+
+def _measure(num_calls: int):
+    loop = aio.new_event_loop()
+    latencies = []
+    started = threading.Event()
+    thread = threading.Thread(target=_submit, args=(loop, num_calls, latencies, started))
+    loop.call_soon(started.set)
+    thread.start()
+    loop.run_forever()
+    thread.join()
+    loop.close()
+    return latencies
+
+
+def _submit(loop: aio.Loop, num_calls: int, latencies, started: threading.Event):
+    started.wait()
+    for i in range(num_calls):
+        time.sleep(0.0005)
+        done = threading.Event()
+        loop.call_soon_threadsafe(_record, latencies, time.perf_counter(), done)
+        done.wait()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def _record(latencies, submitted_at: float, done: threading.Event):
+    latencies.append(time.perf_counter() - submitted_at)
+    done.set()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import random
+import time
+
+import aio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--num-timers', type=int, default=1_000_000)
+    parser.add_argument('--timers', choices=['heap', 'wheel'], action='append')
+    args = parser.parse_args()
+    for timers in args.timers or ['heap', 'wheel']:
+        push_duration, pop_duration = _measure_push_pop(timers, args.num_timers)
+        print(f'{timers} push: {args.num_timers / push_duration:,.0f} timers/sec')
+        print(f'{timers} pop: {args.num_timers / pop_duration:,.0f} timers/sec')
+        churn_duration, num_left = _measure_churn(timers, args.num_timers)
+        print(f'{timers} arm+cancel: {args.num_timers / churn_duration:,.0f} timers/sec, '
+              f'{num_left:,} entries left')
+
+
+def _measure_push_pop(timers: str, num_timers: int):
+    loop = aio.Loop(timers=timers)
+    now = loop.time()
+    delays = [random.random() for _ in range(num_timers)]
+    callback = _Counter(loop, num_timers)
+    started_at = time.perf_counter()
+    for delay in delays:
+        loop.call_at(now - delay, callback)
+    push_duration = time.perf_counter() - started_at
+    started_at = time.perf_counter()
+    loop.run_forever()
+    pop_duration = time.perf_counter() - started_at
+    loop.close()
+    return push_duration, pop_duration
+
+
+def _measure_churn(timers: str, num_timers: int):
+    loop = aio.Loop(timers=timers)
+    delays = [60 + random.random() for _ in range(num_timers)]
+    started_at = time.perf_counter()
+    for delay in delays:
+        loop.call_later(delay, _do_nothing).cancel()
+    duration = time.perf_counter() - started_at
+    # noinspection PyProtectedMember
+    num_left = len(loop._scheduled)
+    loop.close()
+    return duration, num_left
+
+
+def _do_nothing():
+    pass
+
+
+class _Counter:
+    def __init__(self, loop: aio.Loop, num_calls: int):
+        self._loop = loop
+        self._num_left = num_calls
+
+    def __call__(self):
+        self._num_left -= 1
+        if not self._num_left:
+            self._loop.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,7 @@ def future_fixture(request):
 def loop_fixture(request):
     del request  # unused
     loop = aio.new_event_loop()
+    loop.set_debug(logging.getLogger('aio').isEnabledFor(logging.DEBUG))
     aio.set_event_loop(loop)
     yield loop
     loop.close()
@@ -0,0 +1,71 @@
+import socket
+import threading
+
+import pytest
+
+from aio import callback_server
+from aio import common
+
+_WATER_MARKS = callback_server.WaterMarks(high=64 * 1024, low=16 * 1024)
+
+
+@pytest.fixture(name='upstream')
+def upstream_fixture():
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    listener.settimeout(5)
+    thread = threading.Thread(target=_reply_after_eof, args=(listener,))
+    thread.start()
+    yield common.Address(*listener.getsockname())
+    thread.join(5)
+    listener.close()
+
+
+@pytest.mark.parametrize('loop_name', [common.AIO, common.ASYNCIO])
+def test_relays_reply_after_client_half_close(upstream, loop_name):
+    request = b'x' * 100_000
+    received = common.run(_relay, loop_name, upstream, request)
+    assert received == b'reply:' + request
+
+
+async def _relay(loop, upstream: common.Address, request: bytes) -> bytes:
+    done = loop.create_future()
+    server = await loop.create_server(
+        lambda: callback_server.ProxyServerProtocol(loop, upstream, done, _WATER_MARKS),
+        '127.0.0.1', 0)
+    received = []
+    thread = threading.Thread(
+        target=_send_and_half_close,
+        args=(server.sockets[0].getsockname(), request, received))
+    thread.start()
+    try:
+        await done
+    finally:
+        server.close()
+    thread.join(5)
+    return received[0]
+
+
+def _send_and_half_close(address, request: bytes, received) -> None:
+    with socket.create_connection(address, timeout=5) as sock:
+        sock.sendall(request)
+        sock.shutdown(socket.SHUT_WR)
+        received.append(_read_until_eof(sock))
+
+
+def _reply_after_eof(listener: socket.socket) -> None:
+    conn, _ = listener.accept()
+    conn.settimeout(5)
+    with conn:
+        request = _read_until_eof(conn)
+        conn.sendall(b'reply:' + request)
+
+
+def _read_until_eof(sock: socket.socket) -> bytes:
+    chunks = []
+    chunk = sock.recv(65536)
+    while chunk:
+        chunks.append(chunk)
+        chunk = sock.recv(65536)
+    return b''.join(chunks)
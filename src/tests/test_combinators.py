@@ -0,0 +1,170 @@
+import pytest
+
+import aio
+
+
+def test_gather(loop):
+    futures = [_resolve_later(loop, 0.002, 'first'), _resolve_later(loop, 0.001, 'second')]
+    assert loop.run_until_complete(aio.gather(*futures, _coro_return(3))) == [
+        'first', 'second', 3]
+
+
+def test_gather_nothing(loop):
+    assert loop.run_until_complete(aio.gather()) == []
+
+
+def test_gather_propagates_first_exception(loop):
+    pending = aio.Future()
+    with pytest.raises(ZeroDivisionError):
+        loop.run_until_complete(aio.gather(pending, _coro_raise(ZeroDivisionError)))
+    assert not pending.done()
+
+
+def test_gather_return_exceptions(loop):
+    failing = aio.Future()
+    failing.set_exception(ZeroDivisionError())
+    cancelled = aio.Future()
+    cancelled.cancel()
+    result = loop.run_until_complete(
+        aio.gather(failing, cancelled, _coro_return(1), return_exceptions=True))
+    assert isinstance(result[0], ZeroDivisionError)
+    assert isinstance(result[1], aio.CancelledError)
+    assert result[2] == 1
+
+
+def test_gather_cancel_cancels_children(loop):
+    children = [aio.Future(), aio.Future()]
+    gathering = aio.gather(*children)
+    assert gathering.cancel()
+    assert all(child.cancelled() for child in children)
+    with pytest.raises(aio.CancelledError):
+        loop.run_until_complete(gathering)
+    assert gathering.cancelled()
+
+
+def test_gather_many_children_use_shared_callback(loop):
+    children = [aio.Future() for _ in range(1000)]
+    gathering = aio.gather(*children)
+    assert len({id(child._callback) for child in children}) == 1
+    for index, child in enumerate(children):
+        child.set_result(index)
+    assert loop.run_until_complete(gathering) == list(range(1000))
+
+
+def test_wait_all_completed(loop):
+    futures = {_resolve_later(loop, 0.001, 1), _resolve_later(loop, 0.002, 2)}
+    done, pending = loop.run_until_complete(aio.wait(futures))
+    assert done == futures
+    assert not pending
+
+
+def test_wait_first_completed(loop):
+    fast = _resolve_later(loop, 0.001, 1)
+    slow = aio.Future()
+    done, pending = loop.run_until_complete(
+        aio.wait([fast, slow], return_when=aio.FIRST_COMPLETED))
+    assert done == {fast}
+    assert pending == {slow}
+    assert slow._callback is None
+
+
+def test_wait_first_exception(loop):
+    ok = _resolve_later(loop, 0.001, 1)
+    failing = aio.ensure_future(_coro_raise(ZeroDivisionError))
+    slow = aio.Future()
+    done, pending = loop.run_until_complete(
+        aio.wait([ok, failing, slow], return_when=aio.FIRST_EXCEPTION))
+    assert done == {failing}
+    assert pending == {ok, slow}
+
+
+def test_wait_timeout(loop):
+    pending_future = aio.Future()
+    done, pending = loop.run_until_complete(aio.wait([pending_future], timeout=0.001))
+    assert not done
+    assert pending == {pending_future}
+
+
+def test_wait_invalid_arguments(loop):
+    with pytest.raises(ValueError):
+        loop.run_until_complete(aio.wait([]))
+    with pytest.raises(ValueError):
+        loop.run_until_complete(aio.wait([aio.Future()], return_when='bad'))
+
+
+def test_wait_for(loop):
+    future = _resolve_later(loop, 0.001, 'result')
+    assert loop.run_until_complete(aio.wait_for(future, 1.0)) == 'result'
+
+
+def test_wait_for_timeout_cancels(loop):
+    future = aio.Future()
+    with pytest.raises(TimeoutError):
+        loop.run_until_complete(aio.wait_for(future, 0.001))
+    assert future.cancelled()
+
+
+def test_wait_for_timeout_cancels_task(loop):
+    task = aio.ensure_future(_coro_wait(aio.Future()))
+    with pytest.raises(TimeoutError):
+        loop.run_until_complete(aio.wait_for(task, 0.001))
+    assert task.cancelled()
+
+
+def test_wait_for_without_timeout(loop):
+    assert loop.run_until_complete(aio.wait_for(_coro_return(1), None)) == 1
+
+
+def test_as_completed(loop):
+    futures = [
+        _resolve_later(loop, 0.003, 3),
+        _resolve_later(loop, 0.001, 1),
+        _resolve_later(loop, 0.002, 2),
+    ]
+
+    async def collect():
+        return [await next_result for next_result in aio.as_completed(futures)]
+
+    assert loop.run_until_complete(collect()) == [1, 2, 3]
+
+
+def test_as_completed_timeout(loop):
+    futures = [_resolve_later(loop, 0.001, 1), aio.Future()]
+
+    async def collect():
+        results = []
+        for next_result in aio.as_completed(futures, timeout=0.01):
+            try:
+                results.append(await next_result)
+            except TimeoutError:
+                results.append('timeout')
+        return results
+
+    assert loop.run_until_complete(collect()) == [1, 'timeout']
+
+
+def test_as_completed_awaited_concurrently(loop):
+    futures = [_resolve_later(loop, 0.002, 2), _resolve_later(loop, 0.001, 1)]
+
+    async def collect():
+        return await aio.wait_for(aio.gather(*aio.as_completed(futures)), 1.0)
+
+    assert loop.run_until_complete(collect()) == [1, 2]
+
+
+def _resolve_later(loop, delay, result):
+    future = aio.Future()
+    loop.call_later(delay, future.set_result, result)
+    return future
+
+
+async def _coro_return(result):
+    return result
+
+
+async def _coro_raise(exception):
+    raise exception
+
+
+async def _coro_wait(future):
+    return await future
@@ -0,0 +1,31 @@
+import asyncio
+
+import pytest
+
+import aio
+from aio import common
+
+
+@pytest.mark.parametrize('loop_name, loop_type', [
+    (common.AIO, aio.Loop),
+    (common.ASYNCIO, asyncio.AbstractEventLoop),
+])
+def test_run(loop_name, loop_type):
+    loop, value = common.run(_get_loop, loop_name, 1)
+    assert isinstance(loop, loop_type)
+    assert loop.is_closed()
+    assert value == 1
+
+
+def test_default_loops_are_registered():
+    assert {common.AIO, common.ASYNCIO} <= set(common.get_loop_names())
+
+
+def test_parse_loop_argument():
+    args = common.build_arg_parser().parse_args(
+        ['--listen-at=127.0.0.1:1', '--proxy-to=127.0.0.1:2', '--loop=aio'])
+    assert args.loop == common.AIO
+
+
+async def _get_loop(loop, value):
+    return loop, value
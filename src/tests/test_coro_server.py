@@ -0,0 +1,184 @@
+import errno
+import socket
+import threading
+
+import pytest
+
+import aio
+from aio import common
+from aio import coro_server
+from aio import pool
+
+_ADDRESSES = ['--listen-at=127.0.0.1:1', '--proxy-to=127.0.0.1:2']
+
+
+class _Upstream:
+    def __init__(self, reply_after_eof: bool) -> None:
+        self._reply_after_eof = reply_after_eof
+        self._listener = socket.socket()
+        self._listener.bind(('127.0.0.1', 0))
+        self._listener.listen(16)
+        # closing the listener doesn't interrupt a blocking accept(), so it's polled
+        self._listener.settimeout(0.01)
+        self._is_closed = False
+        self.address = common.Address(*self._listener.getsockname())
+        self.peers_with_data = []
+        self._thread = threading.Thread(target=self._accept_connections, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._is_closed = True
+        self._thread.join(5)
+        self._listener.close()
+
+    def _accept_connections(self) -> None:
+        while not self._is_closed:
+            try:
+                conn, peer = self._listener.accept()
+            except socket.timeout:
+                continue
+            threading.Thread(target=self._serve, args=(conn, peer), daemon=True).start()
+
+    def _serve(self, conn: socket.socket, peer) -> None:
+        conn.settimeout(5)
+        with conn:
+            chunks = []
+            chunk = conn.recv(65536)
+            if chunk:
+                self.peers_with_data.append(peer)
+            while chunk:
+                if self._reply_after_eof:
+                    chunks.append(chunk)
+                else:
+                    conn.sendall(chunk)
+                chunk = conn.recv(65536)
+            conn.sendall(b''.join(chunks))
+
+
+@pytest.fixture(name='echo_upstream')
+def echo_upstream_fixture():
+    upstream = _Upstream(reply_after_eof=False)
+    yield upstream
+    upstream.close()
+
+
+@pytest.fixture(name='reply_after_eof_upstream')
+def reply_after_eof_upstream_fixture():
+    upstream = _Upstream(reply_after_eof=True)
+    yield upstream
+    upstream.close()
+
+
+def test_parse_args_workers():
+    assert coro_server.parse_args(_ADDRESSES + ['--workers=4']).workers == 4
+
+
+def test_parse_args_rejects_non_positive_workers():
+    with pytest.raises(SystemExit):
+        coro_server.parse_args(_ADDRESSES + ['--workers=0'])
+
+
+@pytest.mark.parametrize('loop_name', [common.AIO, common.ASYNCIO])
+def test_relays_data(echo_upstream, loop_name):
+    request = b'x' * 1_000_000
+    assert common.run(_relay, loop_name, echo_upstream.address, request) == request
+
+
+@pytest.mark.parametrize('loop_name', [common.AIO, common.ASYNCIO])
+def test_relays_reply_after_client_half_close(reply_after_eof_upstream, loop_name):
+    request = b'x' * 100_000
+    received = common.run(_relay, loop_name, reply_after_eof_upstream.address, request)
+    assert received == request
+
+
+def test_reuses_pooled_connection(echo_upstream):
+    async def relay_through_pool(loop):
+        upstream_pool = pool.ConnectionPool(loop, min_size=1, max_size=1)
+        try:
+            upstream_pool.warm(echo_upstream.address)
+            while not upstream_pool.size(echo_upstream.address):
+                await aio.sleep(0.01)
+            pooled_sock = upstream_pool._idle[echo_upstream.address][0].sock
+            pooled_address = pooled_sock.getsockname()
+            received = await _relay(loop, echo_upstream.address, b'hello', upstream_pool)
+            return pooled_address, received
+        finally:
+            upstream_pool.close()
+
+    pooled_address, received = common.run(relay_through_pool, common.AIO)
+    assert received == b'hello'
+    assert echo_upstream.peers_with_data == [pooled_address]
+
+
+@pytest.mark.parametrize('loop_name', [common.AIO, common.ASYNCIO])
+def test_keeps_serving_after_accept_errors(monkeypatch, echo_upstream, loop_name):
+    listener = _FailingListener(num_failures=2)
+    monkeypatch.setattr(coro_server, '_listen', lambda address, reuse_port: listener)
+    monkeypatch.setattr(coro_server, '_ACCEPT_RETRY_DELAY', 0.01)
+    args = coro_server.parse_args(
+        ['--listen-at=127.0.0.1:0', f'--proxy-to={echo_upstream.address.host}:'
+                                    f'{echo_upstream.address.port}'])
+
+    async def relay_through_server(loop):
+        serving = loop.create_task(coro_server._start(loop, args, False))
+        try:
+            with socket.socket() as client:
+                client.setblocking(False)
+                await loop.sock_connect(client, listener.getsockname())
+                await loop.sock_sendall(client, b'hello')
+                client.shutdown(socket.SHUT_WR)
+                return await _read_until_eof(loop, client)
+        finally:
+            serving.cancel()
+
+    assert common.run(relay_through_server, loop_name) == b'hello'
+    assert listener.num_failures == 0
+
+
+class _FailingListener:
+    def __init__(self, num_failures: int) -> None:
+        self._sock = socket.socket()
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen(16)
+        self._sock.setblocking(False)
+        self.num_failures = num_failures
+
+    def accept(self):
+        if self.num_failures:
+            self.num_failures -= 1
+            raise OSError(errno.EMFILE, 'Too many open files')
+        return self._sock.accept()
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._sock.close()
+
+
+async def _relay(loop, upstream: common.Address, request: bytes, upstream_pool=None) -> bytes:
+    handler = coro_server.Handler(loop, upstream, upstream_pool=upstream_pool)
+    client, proxy_side = socket.socketpair()
+    client.setblocking(False)
+    proxy_side.setblocking(False)
+    with client:
+        handling = loop.create_task(handler(proxy_side))
+        # the response is read concurrently, so the echo can't fill up socket buffers
+        receiving = loop.create_task(_read_until_eof(loop, client))
+        await loop.sock_sendall(client, request)
+        client.shutdown(socket.SHUT_WR)
+        received = await receiving
+        await handling
+    return received
+
+
+async def _read_until_eof(loop, sock: socket.socket) -> bytes:
+    chunks = []
+    chunk = await loop.sock_recv(sock, 65536)
+    while chunk:
+        chunks.append(chunk)
+        chunk = await loop.sock_recv(sock, 65536)
+    return b''.join(chunks)
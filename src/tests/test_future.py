@@ -1,3 +1,5 @@
+import concurrent.futures
+
 import aio
 import pytest
 
@@ -110,5 +112,42 @@ def test_get_loop():
     assert future.get_loop() is loop
 
 
+def test_has_no_dict(future):
+    assert not hasattr(future, '__dict__')
+
+
+def test_wrap_future(loop):
+    concurrent_future = concurrent.futures.Future()
+    future = aio.wrap_future(concurrent_future)
+    concurrent_future.set_result(9)
+    assert loop.run_until_complete(future) == 9
+
+
+def test_wrap_future_exception(loop):
+    concurrent_future = concurrent.futures.Future()
+    future = aio.wrap_future(concurrent_future)
+    concurrent_future.set_exception(ZeroDivisionError())
+    with pytest.raises(ZeroDivisionError):
+        loop.run_until_complete(future)
+
+
+def test_cancel_wrapped_future(loop):
+    concurrent_future = concurrent.futures.Future()
+    future = aio.wrap_future(concurrent_future)
+    future.cancel()
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+    assert concurrent_future.cancelled()
+
+
+def test_wrap_aio_future(future):
+    assert aio.wrap_future(future) is future
+
+
+def test_wrap_non_future():
+    with pytest.raises(TypeError):
+        aio.wrap_future(9)
+
+
 def _do_nothing_callback(future):
     del future  # unused
@@ -0,0 +1,196 @@
+import pytest
+
+import aio
+
+
+def test_lock_uncontended_acquire_doesnt_yield(loop):
+    lock = aio.Lock()
+    coro = lock.acquire()
+    with pytest.raises(StopIteration):
+        coro.send(None)
+    assert lock.locked()
+
+
+def test_lock_is_fifo(loop):
+    lock = aio.Lock()
+    order = []
+
+    async def worker(name):
+        async with lock:
+            order.append(name)
+            await aio.sleep(0)
+
+    async def main():
+        await aio.gather(*[worker(name) for name in range(5)])
+
+    loop.run_until_complete(main())
+    assert order == list(range(5))
+    assert not lock.locked()
+
+
+def test_lock_release_unlocked():
+    with pytest.raises(RuntimeError):
+        aio.Lock().release()
+
+
+def test_lock_cancelled_waiter_is_skipped(loop):
+    lock = aio.Lock()
+    acquired = []
+
+    async def acquire(name):
+        await lock.acquire()
+        acquired.append(name)
+
+    async def main():
+        await lock.acquire()
+        cancelled = aio.ensure_future(acquire('cancelled'))
+        waiting = aio.ensure_future(acquire('waiting'))
+        await aio.sleep(0)
+        cancelled.cancel()
+        lock.release()
+        await waiting
+
+    loop.run_until_complete(main())
+    assert acquired == ['waiting']
+    assert lock.locked()
+    assert not lock._waiters
+
+
+def test_lock_cancelled_after_handover_passes_it_on(loop):
+    lock = aio.Lock()
+    acquired = []
+
+    async def acquire(name):
+        await lock.acquire()
+        acquired.append(name)
+
+    async def main():
+        await lock.acquire()
+        first = aio.ensure_future(acquire('first'))
+        second = aio.ensure_future(acquire('second'))
+        await aio.sleep(0)
+        lock.release()
+        first.cancel()
+        await second
+        return first
+
+    first = loop.run_until_complete(main())
+    assert first.cancelled()
+    assert acquired == ['second']
+
+
+def test_event(loop):
+    event = aio.Event()
+
+    async def main():
+        waiters = [aio.ensure_future(event.wait()) for _ in range(3)]
+        await aio.sleep(0)
+        assert not any(waiter.done() for waiter in waiters)
+        event.set()
+        return await aio.gather(*waiters)
+
+    assert loop.run_until_complete(main()) == [True, True, True]
+    assert event.is_set()
+    event.clear()
+    assert not event.is_set()
+
+
+def test_event_wait_when_set_doesnt_yield(loop):
+    event = aio.Event()
+    event.set()
+    coro = event.wait()
+    with pytest.raises(StopIteration):
+        coro.send(None)
+
+
+def test_condition_notify(loop):
+    condition = aio.Condition()
+    items = []
+    consumed = []
+
+    async def consumer():
+        async with condition:
+            await condition.wait_for(lambda: items)
+            consumed.append(items.pop())
+
+    async def main():
+        consumers = [aio.ensure_future(consumer()) for _ in range(2)]
+        await aio.sleep(0)
+        async with condition:
+            items.append(1)
+            condition.notify()
+        await aio.sleep(0.001)
+        assert consumed == [1]
+        async with condition:
+            items.append(2)
+            condition.notify_all()
+        await aio.gather(*consumers)
+
+    loop.run_until_complete(main())
+    assert consumed == [1, 2]
+    assert not condition.locked()
+
+
+def test_condition_requires_lock(loop):
+    condition = aio.Condition()
+    with pytest.raises(RuntimeError):
+        condition.notify()
+    with pytest.raises(RuntimeError):
+        loop.run_until_complete(condition.wait())
+
+
+def test_condition_cancelled_wait_reacquires_lock(loop):
+    condition = aio.Condition()
+
+    async def wait():
+        async with condition:
+            await condition.wait()
+
+    async def main():
+        task = aio.ensure_future(wait())
+        await aio.sleep(0)
+        await condition.acquire()
+        task.cancel()
+        await aio.sleep(0)
+        assert not task.done()
+        condition.release()
+        with pytest.raises(aio.CancelledError):
+            await task
+
+    loop.run_until_complete(main())
+    assert not condition.locked()
+
+
+def test_semaphore_caps_concurrency(loop):
+    semaphore = aio.Semaphore(2)
+    num_active = 0
+    max_active = 0
+
+    async def worker():
+        nonlocal num_active, max_active
+        async with semaphore:
+            num_active += 1
+            max_active = max(max_active, num_active)
+            await aio.sleep(0.001)
+            num_active -= 1
+
+    async def main():
+        await aio.gather(*[worker() for _ in range(6)])
+
+    loop.run_until_complete(main())
+    assert max_active == 2
+    assert not semaphore.locked()
+
+
+def test_semaphore_invalid_value():
+    with pytest.raises(ValueError):
+        aio.Semaphore(-1)
+
+
+def test_bounded_semaphore(loop):
+    semaphore = aio.BoundedSemaphore(1)
+    loop.run_until_complete(semaphore.acquire())
+    assert semaphore.locked()
+    semaphore.release()
+    with pytest.raises(ValueError):
+        semaphore.release()
@@ -1,3 +1,10 @@
+import concurrent.futures
+import gc
+import operator
+import socket
+import threading
+import time
+
 import aio
 import pytest
 
@@ -6,6 +13,18 @@ def test_get_event_loop():
     assert aio.get_event_loop() is aio.get_event_loop()
 
 
+def test_debug(loop):
+    loop.set_debug(False)
+    assert not loop.get_debug()
+    loop.set_debug(True)
+    assert loop.get_debug()
+
+
+def test_run_in_debug_mode(loop):
+    loop.set_debug(True)
+    assert loop.run_until_complete(_coro_add(1, 2)) == 3
+
+
 def test_fresh_loop_is_not_running(loop):
     assert not loop.is_running()
 
@@ -49,6 +68,17 @@ def test_callback_ordering(loop):
     assert calls == ['first', 'second']
 
 
+def test_call_soon_ordering(loop):
+    calls = []
+    loop.call_later(0, calls.append, 'timer')
+    for i in range(3):
+        loop.call_soon(calls.append, i)
+    loop.call_soon(loop.call_soon, calls.append, 'next_iteration')
+    loop.call_soon(loop.call_soon, _Stopper(loop))
+    loop.run_forever()
+    assert calls == [0, 1, 2, 'timer', 'next_iteration']
+
+
 def test_call_soon_with_arguments(loop):
     calls = []
     loop.call_soon(calls.append, 'first')
@@ -107,6 +137,44 @@ def test_future_remove_done_callback(loop, future):
     assert results == []
 
 
+def test_future_done_callbacks_order(loop, future):
+    calls = []
+    future.add_done_callback(lambda f: calls.append('first'))
+    future.add_done_callback(lambda f: calls.append('second'))
+    future.add_done_callback(lambda f: calls.append('third'))
+    future.add_done_callback(lambda f: loop.stop())
+    loop.call_soon(future.set_result, 9)
+    loop.run_forever()
+    assert calls == ['first', 'second', 'third']
+
+
+def test_future_remove_first_done_callback(loop, future):
+    calls = []
+
+    def add_first(f):
+        del f  # unused
+        calls.append('first')
+
+    future.add_done_callback(add_first)
+    future.add_done_callback(lambda f: calls.append('second'))
+    future.add_done_callback(add_first)
+    future.add_done_callback(lambda f: calls.append('third'))
+    future.add_done_callback(lambda f: loop.stop())
+    assert future.remove_done_callback(add_first) == 2
+    loop.call_soon(future.set_result, 9)
+    loop.run_forever()
+    assert calls == ['second', 'third']
+
+
+def test_future_add_done_callback_after_done(loop, future):
+    calls = []
+    future.set_result(9)
+    future.add_done_callback(lambda f: calls.append(f.result()))
+    future.add_done_callback(lambda f: loop.stop())
+    loop.run_forever()
+    assert calls == [9]
+
+
 def test_task_remove_done_callback(loop):
     results = []
 
@@ -183,6 +251,31 @@ def test_exception_handler(loop):
     assert num_exceptions == 1
 
 
+def test_callbacks_after_exception_run_in_same_iteration(loop):
+    calls = []
+    loop.set_exception_handler(lambda _loop, _context: None)
+    loop.call_soon(_raising, ZeroDivisionError)
+    loop.call_soon(calls.append, 'after')
+    loop.call_soon(_Stopper(loop))
+    loop.run_forever()
+    assert calls == ['after']
+    assert loop.get_num_iterations() == 1
+
+
+def test_callbacks_histogram(loop):
+    for _ in range(4):
+        loop.call_soon(lambda: None)
+    loop.call_soon(loop.call_soon, _Stopper(loop))
+    loop.run_forever()
+    assert loop.get_num_iterations() == 2
+    assert loop.get_callbacks_histogram() == {1: 1, 7: 1}
+
+
+def test_handles_have_no_dict(loop):
+    assert not hasattr(loop.call_soon(print), '__dict__')
+    assert not hasattr(loop.call_later(1.0, print), '__dict__')
+
+
 def test_call_soon_handle(loop):
     handle = loop.call_soon(loop.stop)
     assert not handle.cancelled()
@@ -271,6 +364,12 @@ def test_new_event_loop():
     assert x != y
 
 
+def test_unclosed_loop_does_not_leak_sockets(recwarn):
+    aio.new_event_loop()
+    gc.collect()
+    assert not [warning for warning in recwarn if warning.category is ResourceWarning]
+
+
 def test_set_event_loop():
     loop = aio.new_event_loop()
     aio.set_event_loop(loop)
@@ -432,6 +531,168 @@ def test_ensure_future_on_awaitable(loop, future):
     assert loop.run_until_complete(task) == 9
 
 
+def test_add_reader(loop):
+    calls = []
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        loop.add_reader(reader.fileno(), lambda: calls.append(reader.recv(100)))
+        loop.call_soon(writer.send, b'data')
+        loop.call_soon(loop.add_writer, writer.fileno(), _Stopper(loop))
+        loop.run_forever()
+    assert calls == [b'data']
+
+
+def test_add_writer(loop):
+    calls = []
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        loop.add_writer(writer.fileno(), calls.append, 'first')
+        loop.call_later(0.0001, _Stopper(loop))
+        loop.run_forever()
+    assert calls[0] == 'first'
+
+
+def test_reader_and_writer_on_same_fd(loop):
+    calls = []
+    first, second = socket.socketpair()
+    with first, second:
+        second.send(b'data')
+        loop.add_reader(first.fileno(), calls.append, 'read')
+        loop.add_writer(first.fileno(), calls.append, 'write')
+        assert loop.remove_writer(first.fileno())
+        loop.call_later(0.0001, _Stopper(loop))
+        loop.run_forever()
+        assert loop.remove_reader(first.fileno())
+    assert set(calls) == {'read'}
+
+
+def test_remove_reader(loop):
+    calls = []
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        writer.send(b'data')
+        loop.add_reader(reader.fileno(), calls.append, 'first')
+        assert loop.remove_reader(reader.fileno())
+        loop.call_later(0.0001, _Stopper(loop))
+        loop.run_forever()
+    assert calls == []
+
+
+def test_remove_missing_reader(loop):
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        assert not loop.remove_reader(reader.fileno())
+        loop.add_writer(reader.fileno(), print)
+        assert not loop.remove_reader(reader.fileno())
+
+
+def test_io_wakes_up_loop(loop):
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        loop.add_reader(reader.fileno(), _Stopper(loop))
+        started_at = loop.time()
+        loop.call_soon(writer.send, b'data')
+        loop.call_later(10.0, _Stopper(loop))
+        loop.run_forever()
+    assert loop.time() - started_at < 1.0
+
+
+def test_cant_add_reader_after_close(loop):
+    loop.close()
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        with pytest.raises(RuntimeError):
+            loop.add_reader(reader.fileno(), print)
+
+
+def test_call_soon_threadsafe(loop):
+    calls = []
+
+    def append_and_stop():
+        calls.append(threading.current_thread())
+        loop.stop()
+
+    thread = threading.Thread(target=loop.call_soon_threadsafe, args=(append_and_stop,))
+    loop.call_soon(thread.start)
+    loop.run_forever()
+    thread.join()
+    assert calls == [threading.main_thread()]
+
+
+def test_call_soon_threadsafe_wakes_up_loop(loop):
+    loop.call_later(10.0, _Stopper(loop))
+    thread = threading.Thread(target=_call_soon_threadsafe_after, args=(loop, 0.01, loop.stop))
+    started_at = loop.time()
+    thread.start()
+    loop.run_forever()
+    thread.join()
+    assert loop.time() - started_at < 1.0
+
+
+def test_cancel_call_soon_threadsafe(loop):
+    calls = []
+    handle = loop.call_soon_threadsafe(calls.append, 'first')
+    handle.cancel()
+    loop.call_soon(loop.call_soon, _Stopper(loop))
+    loop.run_forever()
+    assert calls == []
+
+
+def test_cant_call_soon_threadsafe_after_close(loop):
+    loop.close()
+    with pytest.raises(RuntimeError):
+        loop.call_soon_threadsafe(print, 'impossible')
+
+
+def test_run_in_default_executor(loop):
+    future = loop.run_in_executor(None, threading.current_thread)
+    assert loop.run_until_complete(future) is not threading.main_thread()
+
+
+def test_run_in_thread_pool_executor(loop):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        future = loop.run_in_executor(executor, operator.add, 1, 2)
+        assert loop.run_until_complete(future) == 3
+
+
+def test_run_in_process_pool_executor(loop):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+        future = loop.run_in_executor(executor, operator.add, 1, 2)
+        assert loop.run_until_complete(future) == 3
+
+
+def test_run_in_executor_exception(loop):
+    future = loop.run_in_executor(None, operator.truediv, 1, 0)
+    with pytest.raises(ZeroDivisionError):
+        loop.run_until_complete(future)
+
+
+def test_run_in_executor_from_coroutine(loop):
+    assert loop.run_until_complete(_coro_run_in_executor(operator.add, 1, 2)) == 3
+
+
+def test_set_default_executor(loop):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        loop.set_default_executor(executor)
+        thread = loop.run_until_complete(loop.run_in_executor(None, threading.current_thread))
+        assert thread is executor.submit(threading.current_thread).result()
+
+
+def test_cant_run_in_executor_after_close(loop):
+    loop.close()
+    with pytest.raises(RuntimeError):
+        loop.run_in_executor(None, print, 'impossible')
+
+
+async def _coro_run_in_executor(function, *args):
+    return await aio.get_running_loop().run_in_executor(None, function, *args)
+
+
+def _call_soon_threadsafe_after(loop, delay, callback):
+    time.sleep(delay)
+    loop.call_soon_threadsafe(callback)
+
+
 class _Awaitable:
     def __init__(self, future):
         self._future = future
@@ -0,0 +1,52 @@
+import pytest
+
+from aio import metrics
+
+
+def test_registry_snapshot():
+    registry = metrics.Registry()
+    registry.counter('bytes').inc(10)
+    registry.counter('bytes').inc(5)
+    gauge = registry.gauge('active')
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    summary = registry.summary('duration')
+    summary.observe(1.0)
+    summary.observe(3.0)
+    assert registry.snapshot() == {
+        'bytes': 15,
+        'active': 1,
+        'duration_count': 2,
+        'duration_mean': 2.0,
+        'duration_max': 3.0,
+    }
+
+
+def test_empty_summary():
+    registry = metrics.Registry()
+    registry.summary('duration')
+    assert registry.snapshot()['duration_mean'] == 0.0
+
+
+def test_registry_rejects_type_mismatch():
+    registry = metrics.Registry()
+    registry.counter('active')
+    with pytest.raises(ValueError):
+        registry.gauge('active')
+
+
+def test_report_periodically(loop, capsys):
+    registry = metrics.Registry()
+    registry.counter('bytes').inc(3)
+    metrics.report_periodically(registry, loop, 0.001)
+    loop.call_later(0.05, loop.stop)
+    loop.run_forever()
+    assert 'bytes=3' in capsys.readouterr().out
+
+
+def test_report_periodically_includes_loop_stats(loop, capsys):
+    metrics.report_periodically(metrics.Registry(), loop, 0.001)
+    loop.call_later(0.05, loop.stop)
+    loop.run_forever()
+    assert 'callbacks_per_iteration=<=' in capsys.readouterr().out
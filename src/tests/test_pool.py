@@ -0,0 +1,138 @@
+import asyncio
+import socket
+
+import pytest
+
+from aio import common
+from aio import pool
+
+
+@pytest.fixture(name='listener')
+def listener_fixture():
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(16)
+    yield listener
+    listener.close()
+
+
+@pytest.fixture(name='address')
+def address_fixture(listener):
+    host, port = listener.getsockname()
+    return common.Address(host, port)
+
+
+def test_warm_fills_to_min_size(address):
+    async def check():
+        upstream_pool = pool.ConnectionPool(asyncio.get_running_loop(), min_size=3, max_size=5)
+        upstream_pool.warm(address)
+        await _wait_for_size(upstream_pool, address, 3)
+        upstream_pool.close()
+
+    asyncio.run(check())
+
+
+def test_acquire_reuses_idle_connection(address):
+    async def check():
+        upstream_pool = pool.ConnectionPool(asyncio.get_running_loop(), min_size=1, max_size=1)
+        upstream_pool.warm(address)
+        await _wait_for_size(upstream_pool, address, 1)
+        idle_sock = upstream_pool._idle[address][0].sock
+        sock = await upstream_pool.acquire(address)
+        assert sock is idle_sock
+        sock.close()
+        upstream_pool.close()
+
+    asyncio.run(check())
+
+
+def test_acquire_skips_connection_closed_by_peer(listener, address):
+    async def check():
+        upstream_pool = pool.ConnectionPool(asyncio.get_running_loop(), min_size=1, max_size=1)
+        upstream_pool.warm(address)
+        await _wait_for_size(upstream_pool, address, 1)
+        idle_sock = upstream_pool._idle[address][0].sock
+        peer, _ = listener.accept()
+        peer.close()
+        await asyncio.sleep(0.01)
+        sock = await upstream_pool.acquire(address)
+        assert sock is not idle_sock
+        assert idle_sock.fileno() == -1
+        sock.close()
+        upstream_pool.close()
+
+    asyncio.run(check())
+
+
+def test_acquire_keeps_connection_with_pending_data(listener, address):
+    async def check():
+        upstream_pool = pool.ConnectionPool(asyncio.get_running_loop(), min_size=1, max_size=1)
+        upstream_pool.warm(address)
+        await _wait_for_size(upstream_pool, address, 1)
+        idle_sock = upstream_pool._idle[address][0].sock
+        peer, _ = listener.accept()
+        with peer:
+            peer.sendall(b'banner')
+            await asyncio.sleep(0.01)
+            sock = await upstream_pool.acquire(address)
+            assert sock is idle_sock
+            assert sock.recv(1024) == b'banner'
+        sock.close()
+        upstream_pool.close()
+
+    asyncio.run(check())
+
+
+def test_connect_without_addresses(monkeypatch, address):
+    async def check():
+        loop = asyncio.get_running_loop()
+
+        async def getaddrinfo(*args, **kwargs):
+            return []
+
+        monkeypatch.setattr(loop, 'getaddrinfo', getaddrinfo)
+        with pytest.raises(OSError):
+            await pool.connect(loop, address)
+
+    asyncio.run(check())
+
+
+def test_check_evicts_idle_connections(address):
+    async def check():
+        upstream_pool = pool.ConnectionPool(
+            asyncio.get_running_loop(), min_size=1, max_size=3, max_idle_time=0.0)
+        upstream_pool.warm(address)
+        upstream_pool._fill(address, 3)
+        await _wait_for_size(upstream_pool, address, 3)
+        upstream_pool._check()
+        assert upstream_pool.size(address) == 1
+        upstream_pool.close()
+
+    asyncio.run(check())
+
+
+@pytest.mark.parametrize('min_size, max_size', [
+    (-1, 1),
+    (2, 1),
+])
+def test_invalid_sizes(min_size, max_size):
+    with pytest.raises(ValueError):
+        pool.ConnectionPool(None, min_size=min_size, max_size=max_size)
+
+
+def test_acquire_after_close(address):
+    async def check():
+        upstream_pool = pool.ConnectionPool(asyncio.get_running_loop())
+        upstream_pool.close()
+        with pytest.raises(RuntimeError):
+            await upstream_pool.acquire(address)
+
+    asyncio.run(check())
+
+
+async def _wait_for_size(upstream_pool: pool.ConnectionPool, address: common.Address, size: int):
+    for _ in range(100):
+        if upstream_pool.size(address) == size:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f'Expected pool size {size}, got {upstream_pool.size(address)}')
@@ -0,0 +1,131 @@
+import pytest
+
+import aio
+
+
+@pytest.mark.parametrize('queue_class, expected', [
+    (aio.Queue, [3, 1, 2]),
+    (aio.LifoQueue, [2, 1, 3]),
+    (aio.PriorityQueue, [1, 2, 3]),
+])
+def test_order(loop, queue_class, expected):
+    queue = queue_class()
+    for item in [3, 1, 2]:
+        queue.put_nowait(item)
+    assert [queue.get_nowait() for _ in range(3)] == expected
+
+
+def test_nowait_errors():
+    queue = aio.Queue(maxsize=1)
+    with pytest.raises(aio.QueueEmpty):
+        queue.get_nowait()
+    queue.put_nowait(1)
+    assert queue.full()
+    with pytest.raises(aio.QueueFull):
+        queue.put_nowait(2)
+
+
+def test_get_waits_for_put(loop):
+    queue = aio.Queue()
+
+    async def main():
+        getter = aio.ensure_future(queue.get())
+        await aio.sleep(0)
+        assert not getter.done()
+        await queue.put('item')
+        return await getter
+
+    assert loop.run_until_complete(main()) == 'item'
+
+
+def test_put_waits_for_room(loop):
+    queue = aio.Queue(maxsize=1)
+
+    async def main():
+        await queue.put(1)
+        putter = aio.ensure_future(queue.put(2))
+        await aio.sleep(0)
+        assert not putter.done()
+        assert await queue.get() == 1
+        await putter
+        return queue.get_nowait()
+
+    assert loop.run_until_complete(main()) == 2
+
+
+def test_get_many_drains_batch_in_one_wakeup(loop):
+    queue = aio.Queue()
+
+    async def main():
+        getter = aio.ensure_future(queue.get_many(3))
+        await aio.sleep(0)
+        await queue.put_many(range(5))
+        first = await getter
+        return first, await queue.get_many(10)
+
+    assert loop.run_until_complete(main()) == ([0, 1, 2], [3, 4])
+
+
+def test_get_many_invalid_max_items(loop):
+    with pytest.raises(ValueError):
+        loop.run_until_complete(aio.Queue().get_many(0))
+
+
+def test_put_many_applies_backpressure(loop):
+    queue = aio.Queue(maxsize=2)
+    received = []
+
+    async def consume():
+        while len(received) < 5:
+            assert queue.qsize() <= 2
+            received.extend(await queue.get_many(10))
+
+    async def main():
+        consumer = aio.ensure_future(consume())
+        await queue.put_many(range(5))
+        await consumer
+
+    loop.run_until_complete(main())
+    assert received == list(range(5))
+
+
+def test_cancelled_getter_passes_wakeup_on(loop):
+    queue = aio.Queue()
+
+    async def main():
+        cancelled = aio.ensure_future(queue.get())
+        waiting = aio.ensure_future(queue.get())
+        await aio.sleep(0)
+        queue.put_nowait('item')
+        cancelled.cancel()
+        return await waiting
+
+    assert loop.run_until_complete(main()) == 'item'
+
+
+def test_join(loop):
+    queue = aio.Queue()
+    processed = []
+
+    async def consume():
+        while True:
+            items = await queue.get_many(2)
+            processed.extend(items)
+            queue.task_done(len(items))
+
+    async def main():
+        consumer = aio.ensure_future(consume())
+        await queue.put_many(range(5))
+        await queue.join()
+        consumer.cancel()
+
+    loop.run_until_complete(main())
+    assert processed == list(range(5))
+
+
+def test_task_done_too_many_times():
+    queue = aio.Queue()
+    queue.put_nowait(1)
+    queue.task_done()
+    with pytest.raises(ValueError):
+        queue.task_done()
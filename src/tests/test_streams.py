@@ -0,0 +1,102 @@
+import pytest
+
+import aio
+
+
+async def _echo(reader, writer):
+    data = await reader.read(1024)
+    while data:
+        writer.write(data)
+        await writer.drain()
+        data = await reader.read(1024)
+    writer.close()
+
+
+def test_open_connection_and_start_server(loop):
+    async def run():
+        server = await aio.start_server(_echo, '127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()
+        reader, writer = await aio.open_connection(host, port)
+        writer.write(b'hello\nworld\n')
+        await writer.drain()
+        lines = [await reader.readline(), await reader.readexactly(6)]
+        writer.write_eof()
+        rest = await reader.read()
+        writer.close()
+        await writer.wait_closed()
+        server.close()
+        return lines, rest
+
+    assert loop.run_until_complete(run()) == ([b'hello\n', b'world\n'], b'')
+
+
+def test_read_after_eof(loop):
+    reader = aio.StreamReader(loop=loop)
+    reader.feed_data(b'abc')
+    reader.feed_eof()
+    assert loop.run_until_complete(reader.read()) == b'abc'
+    assert reader.at_eof()
+
+
+def test_readexactly_incomplete(loop):
+    reader = aio.StreamReader(loop=loop)
+    reader.feed_data(b'abc')
+    reader.feed_eof()
+    with pytest.raises(aio.IncompleteReadError) as exc_info:
+        loop.run_until_complete(reader.readexactly(5))
+    assert exc_info.value.partial == b'abc'
+
+
+def test_readuntil_waits_for_separator(loop):
+    reader = aio.StreamReader(loop=loop)
+    reader.feed_data(b'ab')
+    loop.call_soon(reader.feed_data, b'c\r')
+    loop.call_later(0.001, reader.feed_data, b'\nd')
+    assert loop.run_until_complete(reader.readuntil(b'\r\n')) == b'abc\r\n'
+
+
+def test_read_raises_exception(loop):
+    reader = aio.StreamReader(loop=loop)
+    loop.call_soon(reader.set_exception, ConnectionResetError())
+    with pytest.raises(ConnectionResetError):
+        loop.run_until_complete(reader.read(1))
+
+
+def test_readexactly_more_than_pause_threshold(loop):
+    num_bytes = 400_000
+
+    async def send_in_small_chunks(reader, writer):
+        del reader  # unused
+        for _ in range(num_bytes // 1000):
+            writer.write(b'x' * 1000)
+            await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await aio.start_server(send_in_small_chunks, '127.0.0.1', 0)
+        reader, writer = await aio.open_connection(*server.sockets[0].getsockname())
+        data = await aio.wait_for(reader.readexactly(num_bytes), 5)
+        writer.close()
+        server.close()
+        return len(data)
+
+    assert loop.run_until_complete(run()) == num_bytes
+
+
+def test_readuntil_limit_overrun(loop):
+    reader = aio.StreamReader(limit=4, loop=loop)
+    reader.feed_data(b'abcdefgh')
+    with pytest.raises(aio.LimitOverrunError):
+        loop.run_until_complete(reader.readuntil(b'\n'))
+    reader.feed_data(b'\nrest\n')
+    with pytest.raises(aio.LimitOverrunError) as exc_info:
+        loop.run_until_complete(reader.readuntil(b'\n'))
+    assert exc_info.value.consumed == 8
+
+
+def test_readline_limit_overrun(loop):
+    reader = aio.StreamReader(limit=4, loop=loop)
+    reader.feed_data(b'abcdefgh\nok\n')
+    with pytest.raises(ValueError):
+        loop.run_until_complete(reader.readline())
+    assert loop.run_until_complete(reader.readline()) == b'ok\n'
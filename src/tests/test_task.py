@@ -38,5 +38,84 @@ def test_get_loop(coro):
     assert task.get_loop() is loop
 
 
+def test_has_no_dict(coro):
+    task = aio.Task(coro)
+    assert not hasattr(task, '__dict__')
+
+
+def test_is_removed_from_all_tasks_when_done(loop):
+    task = aio.Task(_coro_pass())
+    assert task in aio.all_tasks(loop)
+    loop.run_until_complete(task)
+    assert task not in aio.all_tasks(loop)
+
+
+def test_sleep_zero_yields_to_other_callbacks(loop):
+    calls = []
+
+    async def sleeper():
+        loop.call_soon(calls.append, 'callback')
+        result = await aio.sleep(0, 'result')
+        calls.append('sleeper')
+        return result
+
+    assert loop.run_until_complete(sleeper()) == 'result'
+    assert calls == ['callback', 'sleeper']
+
+
+def test_sleep_zero_doesnt_allocate(loop, monkeypatch):
+    num_allocations = 0
+    handle_init = aio.Handle.__init__
+    future_init = aio.Future.__init__
+
+    def counting_handle_init(self, *args, **kwargs):
+        nonlocal num_allocations
+        num_allocations += 1
+        handle_init(self, *args, **kwargs)
+
+    def counting_future_init(self, *args, **kwargs):
+        nonlocal num_allocations
+        num_allocations += 1
+        future_init(self, *args, **kwargs)
+
+    task = aio.Task(_coro_sleep_zero(100))
+    monkeypatch.setattr(aio.Handle, '__init__', counting_handle_init)
+    monkeypatch.setattr(aio.Future, '__init__', counting_future_init)
+    loop.run_until_complete(task)
+    # the only handle is the one running the done callback of run_until_complete
+    assert num_allocations == 1
+
+
+def test_sleep(loop):
+    started_at = loop.time()
+    assert loop.run_until_complete(aio.sleep(0.01, 'result')) == 'result'
+    assert loop.time() - started_at >= 0.01
+
+
+def test_cancel_sleep_releases_timer(loop):
+    task = aio.Task(aio.sleep(10))
+    loop.call_soon(task.cancel)
+    with pytest.raises(aio.CancelledError):
+        loop.run_until_complete(task)
+    assert loop._scheduled.next_when() is None
+
+
+def test_cancel_sleep_zero(loop):
+    task = aio.Task(_coro_sleep_forever())
+    loop.call_soon(task.cancel)
+    with pytest.raises(aio.CancelledError):
+        loop.run_until_complete(task)
+
+
 async def _coro_pass():
     pass
+
+
+async def _coro_sleep_zero(num_times):
+    for _ in range(num_times):
+        await aio.sleep(0)
+
+
+async def _coro_sleep_forever():
+    while True:
+        await aio.sleep(0)
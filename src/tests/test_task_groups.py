@@ -0,0 +1,165 @@
+import pytest
+
+import aio
+
+
+def test_waits_for_children(loop):
+    async def main():
+        async with aio.TaskGroup() as group:
+            first = group.create_task(_return_later(0.002, 1))
+            second = group.create_task(_return_later(0.001, 2))
+        return first.result(), second.result()
+
+    assert loop.run_until_complete(main()) == (1, 2)
+
+
+def test_failed_child_cancels_siblings_and_parent(loop):
+    reached = []
+
+    async def main():
+        async with aio.TaskGroup() as group:
+            sibling = group.create_task(aio.sleep(10))
+            group.create_task(_raise_later(0.001, ZeroDivisionError))
+            await aio.sleep(10)
+            reached.append('body')
+        return sibling
+
+    with pytest.raises(ZeroDivisionError):
+        loop.run_until_complete(main())
+    assert not reached
+    assert not aio.all_tasks(loop)
+
+
+def test_failed_child_during_exit(loop):
+    async def main():
+        async with aio.TaskGroup() as group:
+            sibling = group.create_task(aio.sleep(10))
+            group.create_task(_raise_later(0.001, ZeroDivisionError))
+        return sibling
+
+    with pytest.raises(ZeroDivisionError):
+        loop.run_until_complete(main())
+    assert not aio.all_tasks(loop)
+
+
+def test_body_exception_cancels_children(loop):
+    async def main():
+        async with aio.TaskGroup() as group:
+            child = group.create_task(aio.sleep(10))
+            await aio.sleep(0)
+            raise KeyError('body')
+        return child
+
+    with pytest.raises(KeyError):
+        loop.run_until_complete(main())
+    assert not aio.all_tasks(loop)
+
+
+def test_parent_cancellation_cancels_children(loop):
+    children = []
+
+    async def run_group():
+        async with aio.TaskGroup() as group:
+            children.append(group.create_task(aio.sleep(10)))
+            await aio.sleep(10)
+
+    async def main():
+        parent = aio.ensure_future(run_group())
+        await aio.sleep(0.001)
+        parent.cancel()
+        with pytest.raises(aio.CancelledError):
+            await parent
+
+    loop.run_until_complete(main())
+    assert children[0].cancelled()
+
+
+def test_create_task_after_exit(loop):
+    async def main():
+        async with aio.TaskGroup() as group:
+            pass
+        return group
+
+    group = loop.run_until_complete(main())
+    coro = _return_later(0, 1)
+    with pytest.raises(RuntimeError):
+        group.create_task(coro)
+
+
+def test_timeout(loop):
+    async def main():
+        async with aio.timeout(0.001) as scope:
+            await aio.sleep(10)
+        return scope
+
+    with pytest.raises(TimeoutError):
+        loop.run_until_complete(main())
+
+
+def test_timeout_not_expired(loop):
+    async def main():
+        async with aio.timeout(1) as scope:
+            await aio.sleep(0)
+        return scope
+
+    scope = loop.run_until_complete(main())
+    assert not scope.expired()
+    assert scope._handle is None
+
+
+def test_timeout_none(loop):
+    async def main():
+        async with aio.timeout(None):
+            return await _return_later(0.001, 'result')
+
+    assert loop.run_until_complete(main()) == 'result'
+
+
+def test_timeout_uses_one_timer_for_task_group(loop):
+    num_timers = []
+
+    async def main():
+        futures = [aio.Future() for _ in range(100)]
+        async with aio.timeout(10):
+            async with aio.TaskGroup() as group:
+                for future in futures:
+                    group.create_task(_wait(future))
+                await aio.sleep(0)
+                num_timers.append(len(loop._scheduled))
+                for future in futures:
+                    future.set_result(None)
+
+    loop.run_until_complete(main())
+    assert num_timers == [1]
+
+
+def test_timeout_cancels_task_group(loop):
+    async def main():
+        async with aio.timeout(0.001):
+            async with aio.TaskGroup() as group:
+                for _ in range(100):
+                    group.create_task(_wait(aio.Future()))
+
+    with pytest.raises(TimeoutError):
+        loop.run_until_complete(main())
+    assert not aio.all_tasks(loop)
+
+
+def test_timeout_requires_task(loop):
+    coro = aio.timeout(1).__aenter__()
+    with pytest.raises(RuntimeError):
+        coro.send(None)
+
+
+async def _return_later(delay, result):
+    await aio.sleep(delay)
+    return result
+
+
+async def _raise_later(delay, exception):
+    await aio.sleep(delay)
+    raise exception
+
+
+async def _wait(future):
+    return await future
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+import aio
+
+
+def test_event_loop_is_thread_local(loop):
+    loops = []
+    thread = threading.Thread(target=lambda: loops.append(aio.get_event_loop()))
+    thread.start()
+    thread.join()
+    assert loops[0] is not loop
+    assert aio.get_event_loop() is loop
+
+
+def test_set_event_loop_in_other_thread(loop):
+    thread = threading.Thread(target=aio.set_event_loop, args=(None,))
+    thread.start()
+    thread.join()
+    assert aio.get_event_loop() is loop
+
+
+def test_run_in_threads(loop):
+    results = aio.run_in_threads(_coro_get_running_loop_and_thread, 4)
+    assert len(results) == 4
+    assert len({id(cur_loop) for cur_loop, _ in results}) == 4
+    assert len({thread for _, thread in results}) == 4
+    assert all(cur_loop is not loop for cur_loop, _ in results)
+
+
+def test_run_in_threads_with_args():
+    assert aio.run_in_threads(_coro_add, 2, 1, 2) == [3, 3]
+
+
+def test_run_in_threads_cancels_siblings_on_failure():
+    started = threading.Barrier(3)
+    with pytest.raises(ZeroDivisionError):
+        aio.run_in_threads(_coro_wait_or_fail, 3, started)
+
+
+def test_run_in_threads_invalid_num_threads():
+    with pytest.raises(ValueError):
+        aio.run_in_threads(_coro_add, 0, 1, 2)
+
+
+async def _coro_get_running_loop_and_thread():
+    return aio.get_running_loop(), threading.current_thread()
+
+
+async def _coro_add(x, y):
+    return x + y
+
+
+async def _coro_wait_or_fail(started):
+    index = started.wait()
+    if index == 0:
+        raise ZeroDivisionError
+    await aio.Future()
@@ -0,0 +1,193 @@
+import collections
+import random
+
+import pytest
+
+import aio
+from aio import _timers
+
+
+@pytest.fixture(name='wheel_loop')
+def wheel_loop_fixture(request):
+    del request  # unused
+    loop = aio.Loop(timers='wheel')
+    aio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    aio.set_event_loop(None)
+
+
+def test_unknown_timers():
+    with pytest.raises(ValueError):
+        aio.Loop(timers='unknown')
+
+
+def test_wheel_loop_call_later(wheel_loop):
+    calls = []
+    wheel_loop.call_later(-0.0001, calls.append, 'first')
+    wheel_loop.call_later(0.0002, calls.append, 'second')
+    wheel_loop.call_later(0.0003, wheel_loop.stop)
+    wheel_loop.run_forever()
+    assert calls == ['first', 'second']
+
+
+def test_wheel_loop_callback_ordering(wheel_loop):
+    calls = []
+    now = wheel_loop.time()
+    wheel_loop.call_at(now + 0.0002, calls.append, 'second')
+    wheel_loop.call_at(now + 0.0002, wheel_loop.stop)
+    wheel_loop.call_at(now + 0.0001, calls.append, 'first')
+    wheel_loop.run_forever()
+    assert calls == ['first', 'second']
+
+
+def test_wheel_loop_cancel(wheel_loop):
+    calls = []
+    handle = wheel_loop.call_later(0.0001, calls.append, 'first')
+    handle.cancel()
+    wheel_loop.call_later(0.0001, wheel_loop.stop)
+    wheel_loop.run_forever()
+    assert calls == []
+
+
+def test_wheel_loop_coroutine(wheel_loop):
+    assert wheel_loop.run_until_complete(_sleep(0.002)) is None
+
+
+def test_wheel_remove_releases_slot():
+    wheel = _timers.TimingWheel(now=0.0)
+    handles = [_Handle(when) for when in [0.5, 100.0, 1e9]]
+    for handle in handles:
+        wheel.add(handle)
+    assert len(wheel) == 3
+    for handle in handles:
+        wheel.remove(handle)
+    assert len(wheel) == 0
+    assert wheel.next_when() is None
+
+
+@pytest.mark.parametrize('timers', [
+    _timers.HeapTimers(),
+    _timers.TimingWheel(now=0.0, num_slots=4, num_levels=3),
+])
+def test_pop_ready_order(timers):
+    rng = random.Random(0)
+    handles = [_Handle(rng.choice([0.0, 0.001, 0.003, 0.05, 0.2, 3.0, 100.0]) + rng.random() / 100)
+               for _ in range(500)]
+    for handle in handles:
+        timers.add(handle)
+    cancelled = set(rng.sample(handles, 100))
+    for handle in cancelled:
+        handle.cancel()
+        timers.remove(handle)
+    expected = sorted((h for h in handles if h not in cancelled), key=lambda h: h.when())
+    popped = []
+    now = 0.0
+    while len(popped) < len(expected):
+        next_when = timers.next_when()
+        assert next_when is not None
+        now = max(now, next_when)
+        ready = collections.deque()
+        timers.pop_ready(now, ready)
+        assert all(h.when() <= now for h in ready)
+        popped.extend(ready)
+    assert popped == expected
+
+
+def test_wheel_skips_empty_ticks(monkeypatch):
+    wheel = _timers.TimingWheel(now=0.0)
+    handles = [_Handle(when) for when in [0.5, 3600.0, 1e9]]
+    for handle in handles:
+        wheel.add(handle)
+    num_advances = 0
+    advance = wheel._advance
+
+    def counting_advance():
+        nonlocal num_advances
+        num_advances += 1
+        advance()
+
+    monkeypatch.setattr(wheel, '_advance', counting_advance)
+    ready = collections.deque()
+    wheel.pop_ready(7200.0, ready)
+    assert list(ready) == handles[:2]
+    assert num_advances < 100
+    assert wheel.next_when() is not None
+
+
+@pytest.mark.parametrize('timers', [
+    _timers.HeapTimers(),
+    _timers.TimingWheel(now=0.0, num_slots=4, num_levels=3),
+])
+def test_pop_ready_after_idle_period(timers):
+    rng = random.Random(1)
+    handles = [_Handle(rng.random() * 1000) for _ in range(300)]
+    for handle in handles:
+        timers.add(handle)
+    popped = []
+    for now in [0.5, 7.25, 64.0, 64.0, 333.3, 1000.0]:
+        ready = collections.deque()
+        timers.pop_ready(now, ready)
+        assert all(h.when() <= now for h in ready)
+        popped.extend(ready)
+    assert popped == sorted(handles, key=lambda h: h.when())
+
+
+def test_heap_drops_cancelled_head():
+    heap = _timers.HeapTimers()
+    first, second = _Handle(1.0), _Handle(2.0)
+    heap.add(first)
+    heap.add(second)
+    first.cancel()
+    heap.remove(first)
+    assert heap.next_when() == 2.0
+    assert len(heap) == 1
+
+
+def test_heap_compacts_cancelled():
+    heap = _timers.HeapTimers()
+    handles = [_Handle(float(i)) for i in range(1000)]
+    for handle in handles:
+        heap.add(handle)
+    for handle in handles[::-1][:600]:
+        handle.cancel()
+        heap.remove(handle)
+    assert len(heap) < 1000
+    ready = collections.deque()
+    heap.pop_ready(1000.0, ready)
+    assert list(ready) == handles[:400]
+    assert len(heap) == 0
+
+
+def test_heap_ignores_removal_of_popped_handle():
+    heap = _timers.HeapTimers()
+    handle = _Handle(1.0)
+    heap.add(handle)
+    heap.pop_ready(1.0, collections.deque())
+    handle.cancel()
+    heap.remove(handle)
+    heap.add(_Handle(2.0))
+    assert heap.next_when() == 2.0
+
+
+class _Handle:
+    def __init__(self, when):
+        self._when = when
+        self._cancelled = False
+        self._scheduled = False
+
+    def when(self):
+        return self._when
+
+    def cancel(self):
+        self._cancelled = True
+
+    def cancelled(self):
+        return self._cancelled
+
+
+async def _sleep(duration):
+    future = aio.Future()
+    loop = aio.get_event_loop()
+    loop.call_later(duration, future.set_result, None)
+    await future
@@ -0,0 +1,238 @@
+import errno
+import socket
+
+import pytest
+
+import aio
+from aio import _transports
+
+
+@pytest.fixture(name='socket_pair')
+def socket_pair_fixture():
+    first, second = socket.socketpair()
+    first.setblocking(False)
+    second.setblocking(False)
+    yield first, second
+    first.close()
+    second.close()
+
+
+def test_sock_recv(loop, socket_pair):
+    first, second = socket_pair
+    loop.call_later(0.001, second.send, b'hello')
+    assert loop.run_until_complete(loop.sock_recv(first, 1024)) == b'hello'
+
+
+def test_sock_recv_into(loop, socket_pair):
+    first, second = socket_pair
+    buffer = bytearray(16)
+    second.send(b'hello')
+    assert loop.run_until_complete(loop.sock_recv_into(first, buffer)) == 5
+    assert buffer[:5] == b'hello'
+
+
+def test_sock_sendall_large_data(loop, socket_pair):
+    first, second = socket_pair
+    data = b'x' * (4 * 1024 * 1024)
+
+    async def receive():
+        chunks = []
+        num_bytes = 0
+        while num_bytes < len(data):
+            chunk = await loop.sock_recv(second, 65536)
+            chunks.append(chunk)
+            num_bytes += len(chunk)
+        return b''.join(chunks)
+
+    receiving = loop.create_task(receive())
+    loop.run_until_complete(loop.sock_sendall(first, data))
+    assert loop.run_until_complete(receiving) == data
+
+
+def test_cancel_sock_recv_removes_reader(loop, socket_pair):
+    first, _ = socket_pair
+    future = loop.sock_recv(first, 1024)
+    future.cancel()
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+    assert not loop.remove_reader(first.fileno())
+
+
+def test_sock_connect_and_accept(loop):
+    with socket.socket() as listener:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        listener.setblocking(False)
+
+        async def connect():
+            with socket.socket() as sock:
+                sock.setblocking(False)
+                await loop.sock_connect(sock, listener.getsockname())
+                return sock.getsockname()
+
+        sockname = loop.create_task(connect())
+        conn, address = loop.run_until_complete(loop.sock_accept(listener))
+        conn.close()
+        assert address == loop.run_until_complete(sockname)
+
+
+def test_sock_connect_refused(loop):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        address = sock.getsockname()
+    with socket.socket() as sock:
+        sock.setblocking(False)
+        with pytest.raises(ConnectionRefusedError):
+            loop.run_until_complete(loop.sock_connect(sock, address))
+
+
+def test_getaddrinfo_numeric_host(loop):
+    infos = loop.run_until_complete(
+        loop.getaddrinfo('127.0.0.1', 80, type=socket.SOCK_STREAM))
+    assert infos[0][4] == ('127.0.0.1', 80)
+
+
+def test_create_server_and_connection(loop):
+    server_protocol = _EchoProtocol()
+    client_protocol = _RecordingProtocol(loop)
+
+    async def run():
+        server = await loop.create_server(lambda: server_protocol, '127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()
+        transport, protocol = await loop.create_connection(lambda: client_protocol, host, port)
+        assert protocol is client_protocol
+        transport.write(b'hello')
+        await client_protocol.received
+        transport.close()
+        await client_protocol.lost
+        server.close()
+        await server.wait_closed()
+
+    loop.run_until_complete(run())
+    assert client_protocol.data == b'hello'
+    assert client_protocol.events == ['made', 'data', 'lost']
+
+
+def test_transport_flow_control(loop, socket_pair):
+    first, second = socket_pair
+    protocol = _RecordingProtocol(loop)
+    transport = aio.Transport(loop, first, protocol)
+    transport.set_write_buffer_limits(high=1024, low=0)
+    transport.write(b'x' * (16 * 1024 * 1024))
+    assert protocol.events == ['pause']
+
+    async def drain():
+        while 'resume' not in protocol.events:
+            await loop.sock_recv(second, 1024 * 1024)
+
+    loop.run_until_complete(drain())
+    assert transport.get_write_buffer_size() == 0
+    transport.close()
+    loop.run_until_complete(protocol.lost)
+
+
+def test_transport_eof(loop, socket_pair):
+    first, second = socket_pair
+    protocol = _RecordingProtocol(loop)
+    aio.Transport(loop, first, protocol)
+    second.shutdown(socket.SHUT_WR)
+    loop.run_until_complete(protocol.lost)
+    assert protocol.events == ['made', 'eof', 'lost']
+
+
+def test_resume_reading_after_keep_open_eof(loop, socket_pair):
+    first, second = socket_pair
+    protocol = _KeepOpenProtocol(loop)
+    transport = aio.Transport(loop, first, protocol)
+    second.shutdown(socket.SHUT_WR)
+    loop.run_until_complete(protocol.eof)
+    transport.pause_reading()
+    transport.resume_reading()
+    loop.run_until_complete(aio.sleep(0.01))
+    transport.close()
+    loop.run_until_complete(protocol.lost)
+    assert protocol.events == ['made', 'eof', 'lost']
+
+
+def test_server_backs_off_when_accept_fails(loop, monkeypatch):
+    monkeypatch.setattr(_transports, '_ACCEPT_RETRY_DELAY', 0.01)
+    with socket.socket() as listener, socket.socket() as client:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        client.connect(listener.getsockname())
+        failing_listener = _FailingListener(listener)
+        server = aio.Server(loop, [failing_listener], _EchoProtocol, backlog=100)
+        server.start_serving()
+        loop.run_until_complete(aio.sleep(0.05))
+        server.close()
+    # without backing off the readable listening socket is polled on every iteration
+    assert 1 < failing_listener.num_accepts < 10
+
+
+class _FailingListener:
+    def __init__(self, sock):
+        self._sock = sock
+        self.num_accepts = 0
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def accept(self):
+        self.num_accepts += 1
+        raise OSError(errno.EMFILE, 'Too many open files')
+
+    def close(self):
+        pass
+
+
+class _EchoProtocol(aio.Protocol):
+    def __init__(self):
+        self._transport = None
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def data_received(self, data):
+        self._transport.write(data)
+
+
+class _RecordingProtocol(aio.Protocol):
+    def __init__(self, loop):
+        self.events = []
+        self.data = b''
+        self.received = loop.create_future()
+        self.lost = loop.create_future()
+
+    def connection_made(self, transport):
+        self.events.append('made')
+
+    def data_received(self, data):
+        self.events.append('data')
+        self.data += data
+        if not self.received.done():
+            self.received.set_result(None)
+
+    def eof_received(self):
+        self.events.append('eof')
+
+    def pause_writing(self):
+        self.events.append('pause')
+
+    def resume_writing(self):
+        self.events.append('resume')
+
+    def connection_lost(self, exc):
+        self.events.append('lost')
+        self.lost.set_result(exc)
+
+
+class _KeepOpenProtocol(_RecordingProtocol):
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.eof = loop.create_future()
+
+    def eof_received(self):
+        super().eof_received()
+        if not self.eof.done():
+            self.eof.set_result(None)
+        return True
@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import typing as tp
+
+import pytest
+
+from aio import workers
+
+
+@pytest.fixture(name='started_path')
+def started_path_fixture(tmp_path):
+    return tmp_path / 'started'
+
+
+def test_restarts_exited_worker(started_path):
+    supervisor = _start_supervisor(0.01, 1, _record_start, str(started_path))
+    _wait_for_num_starts(started_path, 3)
+    assert _stop(supervisor) == 0
+
+
+def test_sigterm_stops_all_workers(started_path):
+    supervisor = _start_supervisor(workers._MIN_WORKER_LIFETIME, 3, _hang, str(started_path))
+    _wait_for_num_starts(started_path, 3)
+    assert _stop(supervisor) == 0
+    for worker_pid in _get_worker_pids(started_path):
+        with pytest.raises(ProcessLookupError):
+            os.kill(worker_pid, 0)
+
+
+def test_stop_during_restart_backoff(started_path):
+    supervisor = _start_supervisor(0.5, 1, _exit_first_time_then_hang, str(started_path))
+    _wait_for_num_starts(started_path, 1)
+    # the first worker has exited and the supervisor sleeps before restarting it
+    time.sleep(0.1)
+    assert _stop(supervisor) == 0
+    assert _get_num_starts(started_path) == 1
+
+
+def test_worker_output_is_flushed(tmp_path, started_path):
+    output_path = tmp_path / 'output'
+    worker = _start(_run_worker_with_output, str(output_path), str(started_path))
+    assert _wait_for_exit(worker) == 0
+    assert 'worker output' in output_path.read_text()
+
+
+def _start_supervisor(min_worker_lifetime: float, num_workers: int, target, *args):
+    return _start(_run_supervisor, min_worker_lifetime, num_workers, target, *args)
+
+
+def _start(target, *args):
+    # a forked pytest process would inherit threads left running by other tests
+    process = multiprocessing.get_context('spawn').Process(target=target, args=args)
+    process.start()
+    return process
+
+
+def _run_supervisor(min_worker_lifetime: float, num_workers: int, target, *args) -> None:
+    workers._MIN_WORKER_LIFETIME = min_worker_lifetime
+    workers.run_workers(num_workers, target, *args)
+
+
+def _run_worker_with_output(output_path: str, started_path: str) -> None:
+    sys.stdout = open(output_path, 'w')
+    supervisor = workers._Supervisor(1, _print_and_stop, (started_path,))
+    supervisor._run_worker()
+
+
+def _exit_first_time_then_hang(path: str) -> None:
+    is_restarted = os.path.exists(path)
+    _record_start(path)
+    if is_restarted:
+        time.sleep(60)
+
+
+def _hang(path: str) -> None:
+    _record_start(path)
+    time.sleep(60)
+
+
+def _print_and_stop(path: str) -> None:
+    _record_start(path)
+    print('worker output')
+
+
+def _record_start(path: str) -> None:
+    with open(path, 'a') as file:
+        file.write(f'{os.getpid()}\n')
+
+
+def _get_num_starts(path) -> int:
+    return len(_get_worker_pids(path))
+
+
+def _get_worker_pids(path) -> tp.List[int]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return [int(line) for line in file]
+
+
+def _wait_for_num_starts(path, num_starts: int, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while _get_num_starts(path) < num_starts:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'{num_starts} workers have not started in {timeout} seconds')
+        time.sleep(0.01)
+
+
+def _stop(supervisor) -> int:
+    os.kill(supervisor.pid, signal.SIGTERM)
+    return _wait_for_exit(supervisor)
+
+
+def _wait_for_exit(process, timeout: float = 5.0) -> int:
+    process.join(timeout)
+    if process.exitcode is None:
+        process.kill()
+        process.join()
+        raise TimeoutError(f'Process {process.pid} has not exited in {timeout} seconds')
+    return process.exitcode